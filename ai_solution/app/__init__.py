@@ -10,6 +10,10 @@ from flask_migrate import Migrate
 from app.config import Config
 from app.routes import register_blueprints
 from app.models.models import db, init_db, User
+from app.services.compression import init_compression
+from app.services.counters import init_counters
+from app.services.rollups import init_rollups
+from app.services.json_provider import select_json_provider
 
 load_dotenv()
 
@@ -19,6 +23,8 @@ migrate = Migrate()
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json_provider_class = select_json_provider(Config.JSON_PROVIDER)
+    app.json = app.json_provider_class(app)
     
     # Single CORS configuration
     CORS(app, 
@@ -29,7 +35,8 @@ def create_app():
              r"/api/*": {
                  "origins": "http://localhost:3000",
                  "allow_headers": ["Content-Type", "Authorization"],
-                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+                 "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+                 "expose_headers": ["X-Next-Cursor", "X-Total-Count"]
              }
          })
     
@@ -48,5 +55,8 @@ def create_app():
     migrate.init_app(app, db)
     init_db(db)
     register_blueprints(app)
+    init_compression(app, min_size=Config.COMPRESS_MIN_SIZE)
+    init_counters()
+    init_rollups()
 
     return app
\ No newline at end of file
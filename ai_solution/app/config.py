@@ -8,3 +8,42 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     CORS_HEADERS = 'Content-Type'
     CORS_SUPPORTS_CREDENTIALS = True
+    RETRIEVAL_TOP_K = int(os.getenv('RETRIEVAL_TOP_K', 5))
+    COMPANY_CONTEXT_PATH = os.getenv('COMPANY_CONTEXT_PATH', 'app/data/company_context.json')
+    VECTOR_STORE_PATH = os.getenv('VECTOR_STORE_PATH', 'instance/vector_store')
+    VECTOR_STORE_COMPACT_RATIO = float(os.getenv('VECTOR_STORE_COMPACT_RATIO', 0.25))
+    EMBEDDER = os.getenv('EMBEDDER', 'hashing')
+    EMBEDDING_DIM = int(os.getenv('EMBEDDING_DIM', 1024))
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CHAT_CACHE_TTL = int(os.getenv('CHAT_CACHE_TTL', 3600))
+    CHAT_CACHE_MAX_ENTRIES = int(os.getenv('CHAT_CACHE_MAX_ENTRIES', 1024))
+    LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', 8))
+    LLM_QUEUE_TIMEOUT = float(os.getenv('LLM_QUEUE_TIMEOUT', 2.0))
+    LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')
+    GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
+    LLM_CALL_TIMEOUT = float(os.getenv('LLM_CALL_TIMEOUT', 20.0))
+    LLM_TOTAL_TIMEOUT = float(os.getenv('LLM_TOTAL_TIMEOUT', 45.0))
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))
+    LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', 0.5))
+    LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', 4.0))
+    LLM_HEDGE_PERCENTILE = float(os.environ['LLM_HEDGE_PERCENTILE']) if os.getenv('LLM_HEDGE_PERCENTILE') else None
+    LLM_BREAKER_FAILURE_THRESHOLD = int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', 5))
+    LLM_BREAKER_RESET_TIMEOUT = float(os.getenv('LLM_BREAKER_RESET_TIMEOUT', 30.0))
+    FAKE_LLM_LATENCY_MS = float(os.getenv('FAKE_LLM_LATENCY_MS', 800))
+    FAKE_LLM_LATENCY_SIGMA = float(os.getenv('FAKE_LLM_LATENCY_SIGMA', 0.5))
+    FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv('FAKE_LLM_TOKENS_PER_SECOND', 50))
+    FAKE_LLM_RESPONSE_TOKENS = int(os.getenv('FAKE_LLM_RESPONSE_TOKENS', 60))
+    FAKE_LLM_FAILURE_RATE = float(os.getenv('FAKE_LLM_FAILURE_RATE', 0.0))
+    FAKE_LLM_SEED = int(os.environ['FAKE_LLM_SEED']) if os.getenv('FAKE_LLM_SEED') else None
+    CHAT_HISTORY_TURNS = int(os.getenv('CHAT_HISTORY_TURNS', 6))
+    CHAT_SUMMARY_MAX_CHARS = int(os.getenv('CHAT_SUMMARY_MAX_CHARS', 1500))
+    CHAT_MEMORY_MAX_USERS = int(os.getenv('CHAT_MEMORY_MAX_USERS', 1000))
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_TOKENS_PER_MINUTE = float(os.getenv('RATE_LIMIT_TOKENS_PER_MINUTE', 4000))
+    RATE_LIMIT_BURST_TOKENS = float(os.getenv('RATE_LIMIT_BURST_TOKENS', 8000))
+    RATE_LIMIT_ANONYMOUS_TOKENS_PER_MINUTE = float(os.getenv('RATE_LIMIT_ANONYMOUS_TOKENS_PER_MINUTE', 1000))
+    RATE_LIMIT_ANONYMOUS_BURST_TOKENS = float(os.getenv('RATE_LIMIT_ANONYMOUS_BURST_TOKENS', 2000))
+    RATE_LIMIT_RESPONSE_ESTIMATE = int(os.getenv('RATE_LIMIT_RESPONSE_ESTIMATE', 300))
@@ -2,7 +2,8 @@ from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import CheckConstraint
+from sqlalchemy import CheckConstraint, and_, or_
+from sqlalchemy.ext.hybrid import hybrid_property
 
 # Initialize db here instead of importing it from app
 db = SQLAlchemy()
@@ -16,8 +17,8 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
-    # Relationship with chat messages
-    messages = db.relationship('ChatMessage', backref='user', lazy=True)
+    # Relationship with chat messages; dynamic so a user's history is queried, not loaded whole
+    messages = db.relationship('ChatMessage', backref='user', lazy='dynamic')
     
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -36,8 +37,53 @@ class ChatMessage(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     content = db.Column(db.Text, nullable=False)
     response = db.Column(db.Text)
+    status = db.Column(db.String(20), default='pending')  # pending, answered, failed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Serves per-user history pages in (created_at, id) order
+    __table_args__ = (
+        db.Index('ix_chat_message_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
+class ConversationSummary(db.Model):
+    # Rolling summary of a user's older chat turns, kept so prompts stay bounded
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    summary = db.Column(db.Text, nullable=False, default='')
+    # Last ChatMessage folded into the summary; newer messages are replayed verbatim
+    summarized_through_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ChatUsage(db.Model):
+    # Daily chat volume per rate-limit client (user:<id> or ip:<address>)
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    client_key = db.Column(db.String(64), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    requests = db.Column(db.Integer, nullable=False, default=0)
+    tokens = db.Column(db.Integer, nullable=False, default=0)  # estimated prompt + response tokens
+    throttled = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('day', 'client_key', name='uq_chat_usage_day_client_key'),
+    )
+
+class CollectionVersion(db.Model):
+    # Write counter per collection behind ETags and retrieval freshness, bumped by app.services.counters
+    collection = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    modified_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class SummaryCounters(db.Model):
+    # Single row of dashboard totals, kept in step with the base tables by app.services.counters
+    id = db.Column(db.Integer, primary_key=True)
+    users = db.Column(db.Integer, nullable=False, default=0)
+    inquiries = db.Column(db.Integer, nullable=False, default=0)
+    articles = db.Column(db.Integer, nullable=False, default=0)
+    upcoming_events = db.Column(db.Integer, nullable=False, default=0)
+    # Start of the soonest counted upcoming event, after which upcoming_events is stale; NULL if none
+    upcoming_valid_until = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class ContactInquiry(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
@@ -54,12 +100,24 @@ class ContactInquiry(db.Model):
     submission_date = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default='Pending')
 
+    # Status filter and facet counts; id keeps filtered pages in index order
+    __table_args__ = (
+        db.Index('ix_contact_inquiry_status_id', 'status', 'id'),
+    )
+
     @staticmethod
     def get_by_status(status):
         """Retrieve all inquiries with the specified status."""
         return ContactInquiry.query.filter_by(status=status).all()
 
 
+class InquiryDailyCount(db.Model):
+    # Inquiries submitted per day in each current status, maintained by app.services.rollups
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
 class Solution(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -72,6 +130,10 @@ class Solution(db.Model):
     
     customer = db.relationship('User', backref='solutions', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_solution_industry_id', 'industry', 'id'),
+    )
+
     @staticmethod
     def get_by_industry(industry):
         return Solution.query.filter_by(industry=industry).all()
@@ -90,37 +152,66 @@ class CustomerFeedback(db.Model):
 
     @staticmethod
     def get_average_rating(customer_id):
-        ratings = CustomerFeedback.query.filter_by(customer_id=customer_id).all()
-        return sum(feedback.rating for feedback in ratings) / len(ratings) if ratings else 0
+        # AVG skips feedback left without a rating
+        average = db.session.query(db.func.avg(CustomerFeedback.rating)).filter_by(customer_id=customer_id).scalar()
+        return float(average) if average is not None else 0
+
+
+class CustomerRatingSummary(db.Model):
+    # Per-customer feedback totals, maintained by app.services.rollups
+    customer_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    feedback_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)  # feedback that has a rating
+    rating_total = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
 
 
 class PromotionalEvent(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     event_name = db.Column(db.String(100), nullable=False)
     event_description = db.Column(db.Text)
-    event_start_date = db.Column(db.DateTime)
+    event_start_date = db.Column(db.DateTime, index=True)
     event_end_date = db.Column(db.DateTime)
     location = db.Column(db.String(100))
     image_url = db.Column(db.String(255))
+    # Set by admins; an event also stops being upcoming once it starts (see `upcoming`)
     is_upcoming = db.Column(db.Boolean, default=True)
     
+    @hybrid_property
+    def upcoming(self):
+        """Flagged upcoming and not started yet, worked out at read time so reads never write"""
+        return self.is_upcoming is True and (
+            self.event_start_date is None or self.event_start_date >= datetime.utcnow()
+        )
+    
+    @upcoming.expression
+    def upcoming(cls):
+        return and_(
+            cls.is_upcoming.is_(True),
+            or_(cls.event_start_date.is_(None), cls.event_start_date >= datetime.utcnow())
+        )
+    
     @staticmethod
     def get_events(is_upcoming):
-        return PromotionalEvent.query.filter_by(is_upcoming=is_upcoming).all()
+        upcoming = PromotionalEvent.upcoming
+        return PromotionalEvent.query.filter(upcoming if is_upcoming else ~upcoming).all()
     
     @staticmethod
     def update_is_upcoming():
-        """Update events to mark them as not upcoming if the current date has passed the event start date."""
-        current_date = datetime.utcnow()
-        events_to_update = PromotionalEvent.query.filter(
-            PromotionalEvent.event_start_date < current_date,
-            PromotionalEvent.is_upcoming == True
-        ).all()
+        """Update events to mark them as not upcoming if the current date has passed the event start date.
 
-        for event in events_to_update:
-            event.is_upcoming = False
-        
+        Reads no longer depend on this; it only keeps the stored flag tidy (flask sweep-events).
+        """
+        updated = PromotionalEvent.query.filter(
+            PromotionalEvent.event_start_date < datetime.utcnow(),
+            PromotionalEvent.is_upcoming == True
+        ).update({PromotionalEvent.is_upcoming: False}, synchronize_session=False)
         db.session.commit()
+        return updated
 
 
 class Article(db.Model):
@@ -134,6 +225,10 @@ class Article(db.Model):
     
     author = db.relationship('User', backref='articles', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_article_category_id', 'category', 'id'),
+    )
+
     @staticmethod
     def get_events(category):
         return Article.query.filter_by(category=category).all()
@@ -7,6 +7,9 @@ from app.routes.customer_feedback import feedback_bp
 from app.routes.promotional_events import event_bp
 from app.routes.articles import article_bp
 from app.routes.dashboard import dashboard_bp
+from app.routes.metrics import metrics_bp
+from app.routes.search import search_bp
+from app.routes.export import export_bp
 
 auth_namespace = Namespace('auth', description='Authentication operations')
 chat_namespace = Namespace('chat', description='Chat operations')
@@ -20,6 +23,10 @@ def register_blueprints(app):
     app.register_blueprint(event_bp, url_prefix='/api')
     app.register_blueprint(article_bp, url_prefix='/api')
     app.register_blueprint(dashboard_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(export_bp, url_prefix='/api')
+    # Scraped by Prometheus, so it lives at the conventional path outside /api
+    app.register_blueprint(metrics_bp)
     
     # api = Api(app, title='My API', description='API Documentation with Swagger UI')
     # api.add_namespace(auth_namespace, path='/auth')
@@ -1,5 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import Article, db
+from app.services import retrieval
+from app.services.conditional import conditional_get
+from app.services.facets import facet_counts
+from app.services.pagination import paginate_request
+from app.services.serializers import article_query, serialize_article
 
 article_bp = Blueprint('article', __name__)
 
@@ -16,26 +21,26 @@ def create_article():
         )
         db.session.add(new_article)
         db.session.commit()
+        retrieval.record_changed(new_article)
         return jsonify({'message': 'Article created successfully!'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @article_bp.route('/articles', methods=['GET'])
+@conditional_get('article', 'user')
 def get_articles():
-    articles = Article.query.all()
-    result = [
-        {
-            'id': article.id,
-            'title': article.title,
-            'content': article.content,
-            'author_id': article.author_id,
-            'author_name': article.author.username, 
-            'category': article.category,
-            'published_date': article.published_date,
-            'image_url': article.image_url
-        } for article in articles
-    ]
-    return jsonify(result), 200
+    query = article_query()
+    if request.args.get('category'):
+        query = query.filter(Article.category == request.args.get('category'))
+    articles, headers = paginate_request(query, Article.id)
+    result = [serialize_article(article) for article in articles]
+    return jsonify(result), 200, headers
+
+
+@article_bp.route('/articles/facets', methods=['GET'])
+@conditional_get('article')
+def get_article_facets():
+    return jsonify({'category': facet_counts(Article.category)}), 200
 
 
 @article_bp.route('/articles/<int:id>', methods=['PUT'])
@@ -47,6 +52,7 @@ def update_article(id):
     article.category = data.get('category', article.category)
     article.image_url = data.get('image_url', article.image_url)
     db.session.commit()
+    retrieval.record_changed(article)
     return jsonify({'message': 'Article updated successfully!'}), 200
 
 @article_bp.route('/articles/<int:id>', methods=['DELETE'])
@@ -54,6 +60,7 @@ def delete_article(id):
     article = Article.query.get_or_404(id)
     db.session.delete(article)
     db.session.commit()
+    retrieval.record_deleted(article)
     return jsonify({'message': 'Article deleted successfully!'}), 200
 
 @article_bp.route('/articles/<int:id>', methods=['GET'])
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from app.models.models import User, db
+from app.services.pagination import paginate_request
 from functools import wraps
 from datetime import datetime, timedelta
 import jwt
@@ -87,7 +88,7 @@ def logout():
 
 @auth_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
+    users, headers = paginate_request(User.query, User.id)
     return jsonify({
         'users': [{
             'id': user.id,
@@ -96,7 +97,7 @@ def get_users():
             'role': user.role,
             'created_at': user.created_at.isoformat()
         } for user in users]
-    })
+    }), 200, headers
 
 @auth_bp.route('/users/<int:user_id>/role', methods=['PUT'])
 def update_user_role(user_id):
@@ -1,6 +1,19 @@
-from flask import Blueprint, request, jsonify, abort, render_template
+import asyncio
+import json
+import math
+import time
+from functools import wraps
+from contextlib import closing
+from flask import Blueprint, Response, request, jsonify, abort, make_response, render_template, stream_with_context
+from werkzeug.exceptions import HTTPException
 from flask_login import current_user, login_required
-from app.services.ai_service import ChatbotService
+from app.services.ai_service import ChatbotService, FALLBACK_RESPONSE
+from app.services.llm_executor import llm_executor, LLMSaturatedError
+from app.services.resilience import CircuitOpenError
+from app.services.pagination import InvalidCursor, keyset_page, page_args
+from app.services import metrics
+from app.services.rate_limit import RateLimited, admission, client_key_for, estimate_tokens, record_usage
+from app.config import Config
 from app.models.models import db, ChatMessage
 
 chat_bp = Blueprint("chat", __name__)
@@ -17,44 +30,321 @@ def before_first_request():
     """Initialize chatbot before first request"""
     init_chatbot()
 
+def _saturated_response(retry_after=None):
+    response = jsonify({
+        "error": "The assistant is busy right now",
+        "response": "We're receiving a lot of questions at the moment. Please try again in a few seconds."
+    })
+    response.status_code = 503
+    if retry_after is None:
+        retry_after = llm_executor.queue_timeout
+    response.headers["Retry-After"] = str(max(1, int(math.ceil(retry_after))))
+    return response
+
+def _instrumented(endpoint):
+    """Count a view's responses by status and time it as the '<endpoint>_total' stage.
+
+    A streamed response is timed until its body has been sent, not until the view returns.
+    """
+    def record(started, status):
+        metrics.observe_stage(f"{endpoint}_total", time.perf_counter() - started)
+        metrics.requests_total.inc(endpoint=endpoint, status=status)
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(*args, **kwargs):
+                started, status, streamed = time.perf_counter(), 500, False
+                try:
+                    response = make_response(await view(*args, **kwargs))
+                    status, streamed = response.status_code, response.is_streamed
+                    if streamed:
+                        # The body is still being generated; stop the clock once it has been sent
+                        response.call_on_close(lambda: record(started, status))
+                    return response
+                except HTTPException as e:
+                    status = e.code
+                    raise
+                finally:
+                    if not streamed:
+                        record(started, status)
+        else:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                started, status, streamed = time.perf_counter(), 500, False
+                try:
+                    response = make_response(view(*args, **kwargs))
+                    status, streamed = response.status_code, response.is_streamed
+                    if streamed:
+                        # The body is still being generated; stop the clock once it has been sent
+                        response.call_on_close(lambda: record(started, status))
+                    return response
+                except HTTPException as e:
+                    status = e.code
+                    raise
+                finally:
+                    if not streamed:
+                        record(started, status)
+        return wrapper
+    return decorator
+
+def _rate_limited_response(retry_after):
+    response = jsonify({
+        "error": "Too many requests",
+        "response": "You've sent a lot of questions in a short time. Please wait a moment before asking again."
+    })
+    response.status_code = 429
+    response.headers["Retry-After"] = str(max(1, int(math.ceil(retry_after))))
+    return response
+
+def _admit(client_key, user_id, user_message):
+    """Reserve the request's tokens, returning the reservation or a 429 response"""
+    if not Config.RATE_LIMIT_ENABLED:
+        return None, None
+    try:
+        return admission.admit(client_key, user_message), None
+    except RateLimited as e:
+        metrics.errors.inc(kind="rate_limited")
+        _record_usage(client_key, user_id, throttled=True)
+        return None, _rate_limited_response(e.retry_after)
+
+def _charge(client_key, user_id, reserved, user_message, response):
+    """Settle the reservation with the real size of the exchange and record it for the dashboard"""
+    used = estimate_tokens(user_message) + (estimate_tokens(response) if response else 0)
+    if reserved is not None:
+        admission.settle(client_key, reserved, used)
+    _record_usage(client_key, user_id, tokens=used)
+
+def _record_usage(client_key, user_id, tokens=0, throttled=False):
+    try:
+        record_usage(client_key, user_id, tokens, throttled)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error recording chat usage: {str(e)}")
+
 @chat_bp.route("/")
 def index():
     return render_template("index.html")
 
-@chat_bp.route("/chat", methods=["POST"])
-async def chat():
-    try:
-        user_message = request.json.get("message")
-        if not user_message:
-            abort(400, description="No message provided")
-        
-        # Ensure chatbot is initialized
-        if chatbot_service is None:
-            init_chatbot()
-        
-        # Create chat message record
+def _store_question(user_id, user_message):
+    """Insert the question and commit straight away so no transaction spans the model call"""
+    with metrics.timed("store_question"):
         chat_message = ChatMessage(
-            user_id=current_user.id if current_user.is_authenticated else 1,
-            content=user_message
+            user_id=user_id or 1,
+            content=user_message,
+            status='pending'
         )
         db.session.add(chat_message)
-        
-        # Get AI response
-        ai_response = await chatbot_service.get_ai_response(user_message)
-        
-        # Update chat message with response
-        chat_message.response = ai_response
         db.session.commit()
-        
-        return jsonify({
-            "response": ai_response,
-            "messageId": chat_message.id
-        })
-        
+    return chat_message.id
+
+def _store_response(message_id, response, status):
+    """Write the outcome back in its own short transaction"""
+    with metrics.timed("store_response"):
+        ChatMessage.query.filter_by(id=message_id).update({"response": response, "status": status})
+        db.session.commit()
+
+def _record_outcome(message_id, response, status):
+    """_store_response that logs a database failure instead of turning the reply into a 500"""
+    try:
+        _store_response(message_id, response, status)
     except Exception as e:
         db.session.rollback()
         print(f"Error in chat route: {str(e)}")
+        metrics.errors.inc(kind="storage")
+
+@chat_bp.route("/chat", methods=["POST"])
+@_instrumented("chat")
+async def chat():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        abort(400, description="Request body must be a JSON object")
+    user_message = data.get("message")
+    if not user_message:
+        abort(400, description="No message provided")
+    
+    # Ensure chatbot is initialized
+    if chatbot_service is None:
+        init_chatbot()
+    
+    user_id = current_user.id if current_user.is_authenticated else None
+    client_key = client_key_for(current_user, request.remote_addr)
+    reserved, limited = _admit(client_key, user_id, user_message)
+    if limited:
+        return limited
+    
+    try:
+        message_id = _store_question(user_id, user_message)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in chat route: {str(e)}")
+        metrics.errors.inc(kind="storage")
+        _charge(client_key, user_id, reserved, user_message, None)
         return jsonify({
             "error": "An error occurred processing your request",
-            "response": "I apologize, but I'm having trouble processing your request right now. Please try again later."
-        }), 500
\ No newline at end of file
+            "response": FALLBACK_RESPONSE
+        }), 500
+    
+    # The question is already committed, so a failure from here on is recorded
+    # against it rather than rolled back with it
+    try:
+        ai_response = await chatbot_service.generate_response(user_message, user_id)
+    except LLMSaturatedError:
+        metrics.errors.inc(kind="saturated")
+        _record_outcome(message_id, None, 'failed')
+        _charge(client_key, user_id, reserved, user_message, None)
+        return _saturated_response()
+    except CircuitOpenError as e:
+        # The model is known to be failing; tell the client when to come back
+        metrics.errors.inc(kind="circuit_open")
+        _record_outcome(message_id, None, 'failed')
+        _charge(client_key, user_id, reserved, user_message, None)
+        return _saturated_response(e.retry_after)
+    except Exception as e:
+        print(f"Error generating AI response: {str(e)}")
+        metrics.errors.inc(kind="model")
+        _record_outcome(message_id, None, 'failed')
+        _charge(client_key, user_id, reserved, user_message, None)
+        return jsonify({
+            "response": FALLBACK_RESPONSE,
+            "messageId": message_id
+        })
+    
+    _record_outcome(message_id, ai_response, 'answered')
+    chatbot_service.remember_turn(user_id, message_id, user_message, ai_response)
+    _charge(client_key, user_id, reserved, user_message, ai_response)
+    
+    return jsonify({
+        "response": ai_response,
+        "messageId": message_id
+    })
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@chat_bp.route("/chat/stream", methods=["GET", "POST"])
+@_instrumented("chat_stream")
+def chat_stream():
+    """Stream the chatbot's answer as Server-Sent Events while it is generated"""
+    if request.method == "POST":
+        user_message = (request.get_json(silent=True) or {}).get("message")
+    else:
+        user_message = request.args.get("message")
+    if not user_message:
+        abort(400, description="No message provided")
+    
+    # Ensure chatbot is initialized
+    if chatbot_service is None:
+        init_chatbot()
+    
+    user_id = current_user.id if current_user.is_authenticated else None
+    client_key = client_key_for(current_user, request.remote_addr)
+    
+    # Fail fast while the model is known to be failing
+    retry_after = chatbot_service.backend.breaker.retry_after()
+    if retry_after:
+        return _saturated_response(retry_after)
+    
+    # Hold an LLM slot for the lifetime of the stream; refuse early if none is free
+    try:
+        llm_executor.acquire_slot()
+    except LLMSaturatedError:
+        return _saturated_response()
+    
+    # Reserve tokens only once the stream is going ahead, so a refused stream costs nothing
+    reserved, limited = _admit(client_key, user_id, user_message)
+    if limited:
+        llm_executor.release_slot()
+        return limited
+    
+    # Store the question up front so the stream does not hold a transaction open
+    try:
+        message_id = _store_question(user_id, user_message)
+    except Exception:
+        llm_executor.release_slot()
+        db.session.rollback()
+        _charge(client_key, user_id, reserved, user_message, None)
+        raise
+
+    def generate():
+        parts = []
+        completed = False
+        try:
+            with closing(chatbot_service.stream_ai_response(user_message, user_id)) as stream:
+                for text in stream:
+                    parts.append(text)
+                    yield _sse("token", {"text": text})
+            completed = True
+            yield _sse("done", {"messageId": message_id})
+        except Exception as e:
+            print(f"Error in chat stream: {str(e)}")
+            metrics.errors.inc(kind="stream")
+            yield _sse("error", {
+                "error": "An error occurred processing your request",
+                "messageId": message_id
+            })
+        finally:
+            # Runs on completion, on error and when the client disconnects mid-stream
+            _record_outcome(message_id, "".join(parts) or None, 'answered' if completed else 'failed')
+            if completed:
+                chatbot_service.remember_turn(user_id, message_id, user_message, "".join(parts))
+            _charge(client_key, user_id, reserved, user_message, "".join(parts))
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # Released when the server closes the response, even if the stream never started
+    response.call_on_close(llm_executor.release_slot)
+    return response
+
+@chat_bp.route("/chat/history", methods=["GET"])
+def chat_history():
+    """Return the signed-in user's messages, newest first, one page at a time.
+
+    Pass the returned nextCursor back as ?cursor= to get the next (older) page.
+    Admins may read another user's history with ?user_id=.
+    """
+    if not current_user.is_authenticated:
+        return jsonify({"error": "Authentication required"}), 401
+    user_id = current_user.id
+    if request.args.get("user_id") and current_user.is_admin():
+        user_id = request.args.get("user_id", type=int)
+    
+    limit, cursor = page_args(request.args)
+    try:
+        messages, next_cursor = keyset_page(
+            ChatMessage.query.filter(ChatMessage.user_id == user_id),
+            [ChatMessage.created_at, ChatMessage.id],
+            limit,
+            cursor
+        )
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify({
+        "messages": [
+            {
+                "id": message.id,
+                "content": message.content,
+                "response": message.response,
+                "status": message.status,
+                "created_at": message.created_at
+            } for message in messages
+        ],
+        "nextCursor": next_cursor
+    })
+
+@chat_bp.route("/chat/stats", methods=["GET"])
+def chat_stats():
+    """Report chatbot cache, executor and upstream resilience statistics"""
+    if chatbot_service is None:
+        init_chatbot()
+    return jsonify({
+        "cache": chatbot_service.response_cache.stats(),
+        "executor": llm_executor.stats(),
+        "single_flight": chatbot_service.single_flight.stats(),
+        "llm": chatbot_service.backend.stats(),
+        "rate_limit": admission.stats()
+    })
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import ContactInquiry, db
+from app.services.facets import facet_counts
+from app.services.pagination import paginate_request
 
 contact_bp = Blueprint('contact', __name__)
 
@@ -31,11 +33,11 @@ def get_contacts():
     status = request.args.get('status')
 
     if status:
-        # Use the static method to filter by status
-        contacts = ContactInquiry.get_by_status(status)
+        query = ContactInquiry.query.filter_by(status=status)
     else:
-        # If no status is provided, retrieve all contacts
-        contacts = ContactInquiry.query.all()
+        # If no status is provided, list all contacts
+        query = ContactInquiry.query
+    contacts, headers = paginate_request(query, ContactInquiry.id)
 
     result = [{
         'id': c.id,
@@ -54,7 +56,11 @@ def get_contacts():
         'status': c.status
     } for c in contacts]
 
-    return jsonify(result), 200
+    return jsonify(result), 200, headers
+
+@contact_bp.route('/contacts/facets', methods=['GET'])
+def get_contact_facets():
+    return jsonify({'status': facet_counts(ContactInquiry.status)}), 200
 
 @contact_bp.route('/contacts/<int:id>', methods=['PUT'])
 def update_contact(id):
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import CustomerFeedback, db
+from app.services.pagination import paginate_request
+from app.services.serializers import feedback_query, serialize_feedback
 
 feedback_bp = Blueprint('feedback', __name__)
 
@@ -20,18 +22,9 @@ def create_feedback():
 
 @feedback_bp.route('/feedbacks', methods=['GET'])
 def get_feedbacks():
-    feedbacks = CustomerFeedback.query.all()
-    result = [
-        {
-            'id': feedback.id,
-            'customer_id': feedback.customer_id,
-            'customer_name': feedback.customer.username,  # Get customer name
-            'feedback_text': feedback.feedback_text,
-            'rating': feedback.rating,
-            'feedback_date': feedback.feedback_date
-        } for feedback in feedbacks
-    ]
-    return jsonify(result), 200
+    feedbacks, headers = paginate_request(feedback_query(), CustomerFeedback.id)
+    result = [serialize_feedback(feedback) for feedback in feedbacks]
+    return jsonify(result), 200, headers
 
 
 @feedback_bp.route('/feedbacks/<int:id>', methods=['PUT'])
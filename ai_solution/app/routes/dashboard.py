@@ -1,25 +1,16 @@
 # app/routes/chat.py
-from flask import Blueprint, jsonify
-from app.models.models import User, ContactInquiry, Article, PromotionalEvent, db
+from datetime import date, datetime, timedelta
+from flask import Blueprint, jsonify, request
+from app.models.models import User, ContactInquiry, PromotionalEvent, ChatUsage, db
 from sqlalchemy import func
+from app.services import counters, ratings, rollups
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
 @dashboard_bp.route('/dashboard', methods=['GET'])
 def get_overview():
-    # Total counts
-    total_users = User.query.count()
-    total_inquiries = ContactInquiry.query.count()
-    total_articles = Article.query.count()
-    upcoming_events = PromotionalEvent.query.filter_by(is_upcoming=True).count()
-
-    # Response
-    return jsonify({
-        'total_users': total_users,
-        'total_inquiries': total_inquiries,
-        'total_articles': total_articles,
-        'upcoming_events': upcoming_events,
-    })
+    # Total counts, maintained on write in the summary counters row
+    return jsonify(counters.overview())
 
 # Bar chart data: Count inquiries grouped by status
 @dashboard_bp.route('/inquiries/status', methods=['GET'])
@@ -32,21 +23,81 @@ def get_inquiries_by_status():
     response = [{"status": status, "count": count} for status, count in data]
     return jsonify(response)
 
-# Timeline data: Count inquiries by submission date
+# Timeline data: Count inquiries by submission date, read from the daily rollup
+# ?from=&to= are inclusive ISO dates; ?granularity= is day, week or month
 @dashboard_bp.route('/inquiries/timeline', methods=['GET'])
 def get_inquiries_timeline():
-    data = (
-        db.session.query(func.date(ContactInquiry.submission_date), func.count(ContactInquiry.id))
-        .group_by(func.date(ContactInquiry.submission_date))
-        .order_by(func.date(ContactInquiry.submission_date))
-        .all()
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in rollups.GRANULARITIES:
+        return jsonify({'error': "granularity must be 'day', 'week' or 'month'"}), 400
+    try:
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    data = rollups.timeline(start, end, granularity)
+    query = db.session.query(PromotionalEvent.event_start_date, PromotionalEvent.event_name).filter(
+        PromotionalEvent.event_start_date.isnot(None)
     )
+    if start is not None:
+        query = query.filter(PromotionalEvent.event_start_date >= start)
+    if end is not None:
+        query = query.filter(PromotionalEvent.event_start_date < end + timedelta(days=1))
     events = [
-        {"date": event.event_start_date.date(), "event_name": event.event_name}
-        for event in PromotionalEvent.query.filter(PromotionalEvent.event_start_date.isnot(None)).all()
+        {"date": event_start_date.date(), "event_name": event_name}
+        for event_start_date, event_name in query.order_by(PromotionalEvent.event_start_date)
     ]
     response = {
-        "timeline": [{"date": str(date), "count": count} for date, count in data],
+        "timeline": [{"date": str(day), "count": count} for day, count in data],
         "events": events,
     }
-    return jsonify(response)
\ No newline at end of file
+    return jsonify(response)
+
+# Rating statistics across all feedback, or one customer's with ?customer_id=
+@dashboard_bp.route('/dashboard/ratings', methods=['GET'])
+def get_rating_stats():
+    return jsonify(ratings.rating_stats(request.args.get('customer_id', type=int)))
+
+# Monthly average rating over the last ?months= months (default 12)
+@dashboard_bp.route('/dashboard/ratings/trend', methods=['GET'])
+def get_rating_trend():
+    months = max(1, min(request.args.get('months', 12, type=int), 120))
+    return jsonify(ratings.rating_trend(months, request.args.get('customer_id', type=int)))
+
+# One customer's rating summary, read from the maintained per-customer row
+@dashboard_bp.route('/dashboard/ratings/customers/<int:customer_id>', methods=['GET'])
+def get_customer_rating_summary(customer_id):
+    return jsonify(ratings.customer_summary(customer_id))
+
+# Chat usage per client over the last `days` days, heaviest first
+@dashboard_bp.route('/dashboard/chat-usage', methods=['GET'])
+def get_chat_usage():
+    days = request.args.get('days', 7, type=int)
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    since = datetime.utcnow().date() - timedelta(days=max(days, 1) - 1)
+    data = (
+        db.session.query(
+            ChatUsage.client_key,
+            User.username,
+            func.sum(ChatUsage.requests),
+            func.sum(ChatUsage.tokens),
+            func.sum(ChatUsage.throttled)
+        )
+        .outerjoin(User, User.id == ChatUsage.user_id)
+        .filter(ChatUsage.day >= since)
+        .group_by(ChatUsage.client_key, User.username)
+        .order_by(func.sum(ChatUsage.tokens).desc())
+        .limit(limit)
+        .all()
+    )
+    response = [
+        {
+            "client": client_key,
+            "username": username,
+            "requests": int(requests or 0),
+            "tokens": int(tokens or 0),
+            "throttled": int(throttled or 0),
+        } for client_key, username, requests, tokens, throttled in data
+    ]
+    return jsonify(response)
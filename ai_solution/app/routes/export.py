@@ -0,0 +1,30 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from app.routes.auth import admin_required
+from app.services.export import EXPORTS, FORMATS, filename_for, parse_date, stream_export
+
+export_bp = Blueprint('export', __name__)
+
+@export_bp.route('/export/<name>', methods=['GET'])
+@admin_required
+def export(name):
+    """Download contacts, feedback or chat logs as CSV or NDJSON.
+
+    Optional: format=csv|ndjson, from / to (ISO dates, inclusive), gzip=true
+    """
+    if name not in EXPORTS:
+        return jsonify({'error': f"Unknown export '{name}'"}), 404
+    fmt = request.args.get('format', 'csv')
+    if fmt not in FORMATS:
+        return jsonify({'error': "format must be 'csv' or 'ndjson'"}), 400
+    try:
+        start = parse_date(request.args.get('from'))
+        end = parse_date(request.args.get('to'), end=True)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    compress = request.args.get('gzip', '').lower() == 'true'
+    
+    return Response(
+        stream_with_context(stream_export(name, fmt, start, end, compress)),
+        mimetype='application/gzip' if compress else FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename_for(name, fmt, compress)}"'}
+    )
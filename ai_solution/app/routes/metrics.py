@@ -0,0 +1,24 @@
+from flask import Blueprint, Response
+from app.services import metrics
+from app.services.llm_executor import llm_executor
+
+metrics_bp = Blueprint("metrics", __name__)
+
+def _breaker_open():
+    from app.routes import chat
+    if chat.chatbot_service is None:
+        return 0
+    return 1 if chat.chatbot_service.backend.breaker.state != "closed" else 0
+
+metrics.registry.register(metrics.Gauge(
+    "chat_llm_in_flight", "Model calls currently holding an executor slot", lambda: llm_executor.in_flight))
+metrics.registry.register(metrics.Gauge(
+    "chat_llm_rejected", "Requests turned away because every executor slot was busy",
+    lambda: llm_executor.rejected))
+metrics.registry.register(metrics.Gauge(
+    "chat_llm_breaker_open", "1 while the model circuit breaker is open or half-open", _breaker_open))
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Chat pipeline metrics for this worker in the Prometheus text format"""
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
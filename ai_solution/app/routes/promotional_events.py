@@ -1,5 +1,10 @@
+from datetime import datetime
 from flask import Blueprint, request, jsonify
 from app.models.models import PromotionalEvent, db
+from sqlalchemy import func
+from app.services import retrieval
+from app.services.conditional import conditional_get
+from app.services.pagination import paginate_request
 
 event_bp = Blueprint('event', __name__)
 
@@ -18,22 +23,31 @@ def create_event():
         )
         db.session.add(new_event)
         db.session.commit()
+        retrieval.record_changed(new_event)
         return jsonify({'message': 'Event created successfully!'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+def _event_schedule():
+    """is_upcoming is derived from the start date, so the listing also changes whenever an event starts"""
+    now = datetime.utcnow()
+    start = PromotionalEvent.event_start_date
+    next_start = db.session.query(func.min(start)).filter(start >= now).scalar()
+    last_start = db.session.query(func.max(start)).filter(start < now).scalar()
+    return str(next_start), last_start
+
 @event_bp.route('/events', methods=['GET'])
+@conditional_get('promotional_event', schedule=_event_schedule)
 def get_events():
-    # Update the is_upcoming status for all events
-    PromotionalEvent.update_is_upcoming()
-
     is_filterby_upcomming_events = request.args.get('filter')
 
     if is_filterby_upcomming_events is not None:
         is_filterby_upcomming_events = is_filterby_upcomming_events.lower() == 'true'
-        events = PromotionalEvent.get_events(is_filterby_upcomming_events)
+        upcoming = PromotionalEvent.upcoming
+        query = PromotionalEvent.query.filter(upcoming if is_filterby_upcomming_events else ~upcoming)
     else:
-        events = PromotionalEvent.query.all()
+        query = PromotionalEvent.query
+    events, headers = paginate_request(query, PromotionalEvent.id)
 
     result = [
         {
@@ -43,10 +57,10 @@ def get_events():
             'event_start_date': event.event_start_date,
             'event_end_date': event.event_end_date,
             'location': event.location,
-            'is_upcoming': event.is_upcoming
+            'is_upcoming': event.upcoming
         } for event in events
     ]
-    return jsonify(result), 200
+    return jsonify(result), 200, headers
 
 @event_bp.route('/events/<int:id>', methods=['PUT'])
 def update_event(id):
@@ -59,6 +73,7 @@ def update_event(id):
     event.location = data.get('location', event.location)
     event.is_upcoming = data.get('is_upcoming', event.is_upcoming)
     db.session.commit()
+    retrieval.record_changed(event)
     return jsonify({'message': 'Event updated successfully!'}), 200
 
 @event_bp.route('/events/<int:id>', methods=['DELETE'])
@@ -66,6 +81,7 @@ def delete_event(id):
     event = PromotionalEvent.query.get_or_404(id)
     db.session.delete(event)
     db.session.commit()
+    retrieval.record_deleted(event)
     return jsonify({'message': 'Event deleted successfully!'}), 200
 
 @event_bp.route('/events/<int:id>', methods=['GET'])
@@ -80,7 +96,7 @@ def get_event_by_id(id):
             'event_end_date': event.event_end_date,
             'location': event.location,
             'image_url': event.image_url,
-            'is_upcoming': event.is_upcoming
+            'is_upcoming': event.upcoming
         }
         return jsonify(result), 200
     except Exception as e:
@@ -0,0 +1,27 @@
+from flask import Blueprint, request, jsonify
+from app.services.search import search
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+def search_catalog():
+    """Ranked search over articles and solutions with highlighted snippets"""
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    
+    types = ('article', 'solution')
+    if request.args.get('type'):
+        if request.args.get('type') not in types:
+            return jsonify({'error': "type must be 'article' or 'solution'"}), 400
+        types = (request.args.get('type'),)
+    
+    limit = max(1, min(request.args.get('limit', 20, type=int), 50))
+    page = max(1, request.args.get('page', 1, type=int))
+    results, has_more = search(q, types, limit=limit, offset=(page - 1) * limit)
+    return jsonify({
+        'results': results,
+        'page': page,
+        'limit': limit,
+        'has_more': has_more
+    }), 200
@@ -1,5 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import Solution, db
+from app.services import retrieval
+from app.services.conditional import conditional_get
+from app.services.facets import facet_counts
+from app.services.pagination import paginate_request
+from app.services.serializers import serialize_solution, solution_query
 
 solution_bp = Blueprint('solution', __name__)
 
@@ -17,27 +22,26 @@ def create_solution():
         )
         db.session.add(new_solution)
         db.session.commit()
+        retrieval.record_changed(new_solution)
         return jsonify({'message': 'Solution created successfully!'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 @solution_bp.route('/solutions', methods=['GET'])
+@conditional_get('solution', 'user')
 def get_solutions():
-    solutions = Solution.query.all()
-    result = [
-        {
-            'id': solution.id,
-            'customer_id': solution.customer_id,
-            'customer_name': solution.customer.username,  # Get customer name
-            'title': solution.title,
-            'description': solution.description,
-            'industry': solution.industry,
-            'key_features': solution.key_features,
-            'image_url': solution.image_url,
-            'created_at': solution.created_at
-        } for solution in solutions
-    ]
-    return jsonify(result), 200
+    query = solution_query()
+    if request.args.get('industry'):
+        query = query.filter(Solution.industry == request.args.get('industry'))
+    solutions, headers = paginate_request(query, Solution.id)
+    result = [serialize_solution(solution) for solution in solutions]
+    return jsonify(result), 200, headers
+
+
+@solution_bp.route('/solutions/facets', methods=['GET'])
+@conditional_get('solution')
+def get_solution_facets():
+    return jsonify({'industry': facet_counts(Solution.industry)}), 200
 
 
 @solution_bp.route('/solutions/<int:id>', methods=['PUT'])
@@ -50,6 +54,7 @@ def update_solution(id):
     solution.key_features = data.get('key_features', solution.key_features)
     solution.image_url = data.get('image_url', solution.image_url)
     db.session.commit()
+    retrieval.record_changed(solution)
     return jsonify({'message': 'Solution updated successfully!'}), 200
 
 @solution_bp.route('/solutions/<int:id>', methods=['DELETE'])
@@ -57,4 +62,5 @@ def delete_solution(id):
     solution = Solution.query.get_or_404(id)
     db.session.delete(solution)
     db.session.commit()
+    retrieval.record_deleted(solution)
     return jsonify({'message': 'Solution deleted successfully!'}), 200
@@ -1,24 +1,53 @@
-import google.generativeai as genai
 from typing import Dict
+import asyncio
+import hashlib
 import json
-from pathlib import Path
+import time
+from contextlib import closing
 from app.config import Config
-from app.models.models import Article, PromotionalEvent
-from datetime import datetime
+from app.services import retrieval
+from app.services.chunking import load_company_context
+from app.services.conversation_memory import ConversationMemory, format_turns
+from app.services.llm_backends import create_llm_backend
+from app.services.llm_executor import llm_executor, LLMSaturatedError
+from app.services import metrics
+from app.services.resilience import CircuitOpenError
+from app.services.response_cache import create_response_cache
+from app.services.single_flight import SingleFlight
+from app.models.models import db
 from flask import current_app
 
+FALLBACK_RESPONSE = "I apologize, but I'm having trouble processing your request right now. Please try again later."
+
+
+class ChatbotError(Exception):
+    """Raised when the model does not produce an answer"""
+
+
 class ChatbotService:
     def __init__(self):
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+        self.backend = create_llm_backend()
         self.company_context = self._load_company_context()
         self.system_prompt = self._generate_system_prompt()
+        retrieval.build_index()
+        retrieval.sync_vector_store(self.company_context)
+        context_fingerprint = hashlib.sha256(
+            json.dumps(self.company_context, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        self.response_cache = create_response_cache(
+            context_fingerprint, Config.CHAT_CACHE_TTL, Config.CHAT_CACHE_MAX_ENTRIES
+        )
+        self.single_flight = SingleFlight()
+        self.conversation_memory = ConversationMemory(
+            self._summarize,
+            window_turns=Config.CHAT_HISTORY_TURNS,
+            max_summary_chars=Config.CHAT_SUMMARY_MAX_CHARS,
+            max_users=Config.CHAT_MEMORY_MAX_USERS,
+        )
         
     def _load_company_context(self) -> Dict:
         """Load company-specific information from JSON file"""
-        context_path = Path("app/data/company_context.json")
-        with open(context_path, 'r') as f:
-            return json.load(f)
+        return load_company_context()
     
     def _generate_system_prompt(self) -> str:
         """Generate the system prompt that defines chatbot behavior"""
@@ -50,53 +79,154 @@ class ChatbotService:
 
     def _get_relevant_db_content(self, user_message: str) -> str:
         """Retrieve relevant content from database based on user query"""
+        retrieval.ensure_fresh()
+        chunks = retrieval.hybrid_search(user_message, k=Config.RETRIEVAL_TOP_K)
+        if not chunks:
+            return ""
+
+        headings = {
+            'company_context': "Company Information:",
+            'article': "Relevant Articles:",
+            'promotional_event': "Relevant Events:",
+            'solution': "Relevant Solutions:",
+        }
         relevant_content = []
-        
-        # Get recent articles
-        articles = Article.query.limit(5).all()
-        if articles:
-            relevant_content.append("Recent Articles:")
-            for article in articles:
-                relevant_content.append(f"- {article.title}: {article.content[:200]}...")
-        
-        # Get upcoming events
-        events = PromotionalEvent.query.filter(
-            PromotionalEvent.event_start_date >= datetime.utcnow(),
-            PromotionalEvent.is_upcoming == True
-        ).limit(3).all()
-        if events:
-            relevant_content.append("\nUpcoming Events:")
-            for event in events:
-                relevant_content.append(
-                    f"- {event.event_name} ({event.event_start_date.strftime('%Y-%m-%d')}): {event.event_description}"
-                )
+        for kind, heading in headings.items():
+            matches = [chunk for chunk in chunks if chunk.kind == kind]
+            if matches:
+                relevant_content.append(heading)
+                relevant_content.extend(f"- {chunk.text}" for chunk in matches)
         
         return "\n".join(relevant_content)
 
-    async def get_ai_response(self, user_message: str) -> str:
-        """Generate AI response using RAG approach"""
-        try:
-            # Initialize chat with system prompt
-            chat = self.model.start_chat(history=[])
-            
-            # Get relevant database content
-            with current_app.app_context():
-                db_context = self._get_relevant_db_content(user_message)
-            
-            # Construct full context for the current query
-            current_context = f"""
+    def _build_prompt(self, user_message: str, summary: str = "", turns=()) -> str:
+        """Combine the system prompt, retrieved content, conversation history and the user's question"""
+        # Get relevant database content
+        with current_app.app_context(), metrics.timed("retrieval"):
+            db_context = self._get_relevant_db_content(user_message)
+        
+        started = time.perf_counter()
+        history = ""
+        if summary:
+            history += f"\nCONVERSATION SUMMARY:\n{summary}\n"
+        if turns:
+            history += f"\nRECENT CONVERSATION:\n{format_turns(turns)}\n"
+        
+        # Construct full context for the current query
+        prompt = f"""
             {self.system_prompt}
             
             CURRENT RELEVANT CONTENT:
             {db_context}
-            
+            {history}
             USER QUERY: {user_message}
             """
-            
-            # Generate response
-            response = chat.send_message(current_context)
-            return response.text or "I apologize, but I encountered an issue processing your request."
-            
+        metrics.observe_stage("prompt", time.perf_counter() - started)
+        metrics.prompt_chars.observe(len(prompt))
+        return prompt
+
+    def _conversation(self, user_id):
+        """Return (summary, recent turns) for a signed-in user; anonymous chats have no memory"""
+        if user_id is None:
+            return "", []
+        return self.conversation_memory.context_for(user_id)
+
+    def _summarize(self, prompt: str) -> str:
+        """Run a conversation-summary prompt under the same in-flight cap as chat answers"""
+        return llm_executor.submit(self.backend.generate, prompt).result()
+
+    def _generate(self, prompt: str, cache_key: str = None) -> str:
+        """Call the model once and cache a non-empty answer"""
+        with metrics.timed("llm"):
+            response_text = self.backend.generate(prompt)
+        if response_text and cache_key:
+            self.response_cache.set(cache_key, response_text)
+        return response_text
+
+    async def generate_response(self, user_message: str, user_id: int = None) -> str:
+        """Generate AI response using RAG approach, raising ChatbotError if no answer is produced"""
+        with metrics.timed("conversation_load"):
+            summary, turns = self._conversation(user_id)
+
+        if summary or turns:
+            # The answer depends on the conversation so far, so it is neither cached nor shared
+            prompt = self._build_prompt(user_message, summary, turns)
+            # The model call does not need the request's database connection; hand it
+            # back to the pool instead of holding it for the whole generation
+            db.session.close()
+            response_text = await llm_executor.run(self._generate, prompt)
+        else:
+            # Answer repeated questions from the cache while the sources are unchanged
+            with metrics.timed("cache_lookup"):
+                cache_key = self.response_cache.key_for(user_message)
+                cached_response = self.response_cache.get(cache_key)
+            metrics.cache_requests.inc(result="miss" if cached_response is None else "hit")
+            if cached_response is not None:
+                metrics.response_chars.observe(len(cached_response))
+                return cached_response
+            db.session.close()
+
+            # Identical concurrent questions share one generation on the bounded LLM pool.
+            # The cache key already covers the normalised question and the retrieval sources.
+            response_text = await asyncio.wrap_future(self.single_flight.do(
+                cache_key,
+                lambda: llm_executor.submit(self._generate, self._build_prompt(user_message), cache_key)
+            ))
+
+        if not response_text:
+            raise ChatbotError("The model returned an empty response")
+        metrics.response_chars.observe(len(response_text))
+        return response_text
+
+    async def get_ai_response(self, user_message: str, user_id: int = None) -> str:
+        """Generate AI response using RAG approach"""
+        try:
+            return await self.generate_response(user_message, user_id)
+        except (LLMSaturatedError, CircuitOpenError):
+            raise
+        except ChatbotError:
+            return "I apologize, but I encountered an issue processing your request."
         except Exception as e:
             print(f"Error generating AI response: {str(e)}")
-            return "I apologize, but I'm having trouble processing your request right now. Please try again later."
\ No newline at end of file
+            return FALLBACK_RESPONSE
+
+    def stream_ai_response(self, user_message: str, user_id: int = None):
+        """Yield the AI response in pieces as the model generates them.
+
+        Closing the generator early (e.g. when the client disconnects) closes the
+        backend stream, which cancels the upstream call.
+        """
+        with metrics.timed("conversation_load"):
+            summary, turns = self._conversation(user_id)
+        cache_key = None
+        if not (summary or turns):
+            with metrics.timed("cache_lookup"):
+                cache_key = self.response_cache.key_for(user_message)
+                cached_response = self.response_cache.get(cache_key)
+            metrics.cache_requests.inc(result="miss" if cached_response is None else "hit")
+            if cached_response is not None:
+                metrics.response_chars.observe(len(cached_response))
+                yield cached_response
+                return
+
+        parts = []
+        prompt = self._build_prompt(user_message, summary, turns)
+        # Release the request's database connection before the model starts streaming
+        db.session.close()
+        started = time.perf_counter()
+        with closing(self.backend.stream(prompt)) as stream:
+            for text in stream:
+                if not parts:
+                    metrics.observe_stage("llm_first_token", time.perf_counter() - started)
+                parts.append(text)
+                yield text
+        metrics.observe_stage("llm_stream", time.perf_counter() - started)
+        metrics.response_chars.observe(len("".join(parts)))
+
+        if parts and cache_key:
+            self.response_cache.set(cache_key, "".join(parts))
+
+    def remember_turn(self, user_id: int, message_id: int, user_message: str, response: str):
+        """Add a completed exchange to the user's conversation memory"""
+        if user_id is not None:
+            self.conversation_memory.record_turn(user_id, message_id, user_message, response)
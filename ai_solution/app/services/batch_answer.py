@@ -0,0 +1,131 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from app.services.llm_executor import LLMSaturatedError
+from app.services.load_test import percentile
+
+# How often a question waits for a free LLM slot before it is recorded as failed
+SATURATED_ATTEMPTS = 8
+SATURATED_BACKOFF = 0.5
+
+
+def read_questions(path):
+    """Yield (id, question) from a JSONL file of {"id": ..., "question": ...} objects.
+
+    `message` is accepted in place of `question`, and lines without an id are
+    numbered by their line in the file so a rerun gives them the same id.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            question = record.get("question") or record.get("message")
+            if not question:
+                raise ValueError(f"Line {line_number} has no question")
+            yield str(record.get("id", line_number)), question
+
+
+def completed_ids(path, retry_failed=False):
+    """Ids already answered in an existing output file, so an interrupted run can resume"""
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue    # a line cut short when the previous run was killed
+                if record.get("status") == "ok" or not retry_failed:
+                    done.add(str(record["id"]))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def trim_partial_line(path):
+    """Cut off a last line left without its newline by a killed run, so appends start on a fresh line"""
+    try:
+        f = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, 2)
+        position = end
+        while position > 0:
+            step = min(4096, position)
+            f.seek(position - step)
+            block = f.read(step)
+            if position == end and block.endswith(b"\n"):
+                return
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                f.truncate(position - step + newline + 1)
+                return
+            position -= step
+        f.truncate(0)
+
+
+def run_batch(app, chatbot_service, input_path, output_path, concurrency=4, retry_failed=False):
+    """Answer every question in `input_path` that `output_path` does not have yet.
+
+    Answers are appended to `output_path` as JSON lines in completion order and
+    flushed one by one, so killing the run loses at most the questions in flight.
+    Returns a summary dict.
+    """
+    trim_partial_line(output_path)
+    done = completed_ids(output_path, retry_failed)
+    pending = [(qid, question) for qid, question in read_questions(input_path) if qid not in done]
+    write_lock = threading.Lock()
+    latencies = []
+    failures = 0
+
+    def answer(qid, question):
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        record = {"id": qid, "question": question, "started_at": started_at.isoformat()}
+        with app.app_context():
+            for attempt in range(SATURATED_ATTEMPTS):
+                try:
+                    record["answer"] = asyncio.run(chatbot_service.generate_response(question))
+                    record["status"] = "ok"
+                    break
+                except LLMSaturatedError as e:
+                    # Only possible when the pool is smaller than --concurrency; back off and wait our turn
+                    if attempt == SATURATED_ATTEMPTS - 1:
+                        record["status"] = "error"
+                        record["error"] = str(e)
+                        break
+                    time.sleep(SATURATED_BACKOFF * 2 ** attempt)
+                except Exception as e:
+                    record["status"] = "error"
+                    record["error"] = str(e)
+                    break
+        record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        with write_lock:
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            latencies.append(record["latency_ms"])
+        return record["status"] == "ok"
+
+    started = time.perf_counter()
+    with open(output_path, "a", encoding="utf-8") as out:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch-answer") as pool:
+            for ok in pool.map(lambda item: answer(*item), pending):
+                if not ok:
+                    failures += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'skipped': len(done),
+        'answered': len(pending) - failures,
+        'failed': failures,
+        'elapsed_seconds': elapsed,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+    }
@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from app.config import Config
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class MemoryBackend:
+    """Per-process key/value store with LRU eviction and per-entry TTL.
+
+    Counters live outside the LRU so version stamps are never evicted. Token buckets
+    have their own LRU, so a flood of one-off clients cannot evict cached responses.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at or None, value)
+        self._counters = {}
+        self._buckets = OrderedDict()   # key -> (tokens, updated_at)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counters(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def take_tokens(self, key, cost, capacity, rate, force=False):
+        """Refill the bucket at `rate` per second up to `capacity`, then try to take `cost`.
+
+        Returns (taken, tokens left). With `force` the cost is taken regardless and the
+        balance may go negative, which is how later corrections are charged.
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            taken = force or tokens >= cost
+            if taken:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return taken, tokens
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Key/value store shared by every worker; Redis handles TTL and LRU eviction"""
+
+    def __init__(self, url, prefix="ai_solution:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.evictions = 0
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or None)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + "counter:" + key)
+
+    def get_counters(self, keys):
+        values = self.client.mget([self.prefix + "counter:" + key for key in keys])
+        return [int(value or 0) for value in values]
+
+    # Refill and take in one atomic step so workers sharing a bucket cannot overdraw it
+    TAKE_TOKENS_SCRIPT = """
+    local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+    local updated_at = tonumber(redis.call('HGET', KEYS[1], 'updated_at'))
+    local cost, capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+    if tokens == nil then
+        tokens, updated_at = capacity, now
+    end
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+    local taken = 0
+    if ARGV[5] == '1' or tokens >= cost then
+        tokens = tokens - cost
+        taken = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+    return {taken, tostring(tokens)}
+    """
+
+    def take_tokens(self, key, cost, capacity, rate, force=False):
+        taken, tokens = self.client.eval(
+            self.TAKE_TOKENS_SCRIPT, 1, self.prefix + "bucket:" + key,
+            cost, capacity, rate, time.time(), '1' if force else '0'
+        )
+        return bool(taken), float(tokens)
+
+    def __len__(self):
+        # Only this backend's entries: the database may be shared, and counters and
+        # rate-limit buckets live under the same prefix. SCAN walks the keyspace, so
+        # this is for the stats endpoint, not the request path.
+        internal = (self.prefix + "counter:", self.prefix + "bucket:")
+        return sum(
+            1 for key in self.client.scan_iter(match=self.prefix + "*", count=1000)
+            if not key.decode("utf-8").startswith(internal)
+        )
+
+
+def create_backend(max_entries=1024):
+    """Build the backend selected by CACHE_BACKEND"""
+    if Config.CACHE_BACKEND == 'redis':
+        return RedisBackend(Config.CACHE_REDIS_URL)
+    if Config.CACHE_BACKEND == 'memory':
+        return MemoryBackend(max_entries=max_entries)
+    raise ValueError(f"Unknown CACHE_BACKEND '{Config.CACHE_BACKEND}'")
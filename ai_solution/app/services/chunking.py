@@ -0,0 +1,85 @@
+import json
+import re
+from collections import namedtuple
+from pathlib import Path
+from app.config import Config
+from app.models.models import Article, PromotionalEvent, Solution
+
+# A chunk is the unit of retrieval: one passage of one database record.
+Chunk = namedtuple("Chunk", ["key", "kind", "record_id", "title", "text"])
+
+CHUNK_WORDS = 120
+
+STOPWORDS = frozenset("""
+a about an and are as at be by can do does for from how i in is it me my of on or
+our please tell that the their there this to us was we what when where which who
+why will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase the text and split it into index terms, dropping stopwords"""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def record_key(record):
+    """Return the (kind, id) key that identifies a database record in the index"""
+    return (record.__tablename__, record.id)
+
+
+def _split_words(text, size=CHUNK_WORDS):
+    words = (text or "").split()
+    if not words:
+        return [""]
+    return [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+
+def chunks_for_record(record):
+    """Split an Article, PromotionalEvent or Solution into retrievable chunks"""
+    kind, record_id = record_key(record)
+
+    if isinstance(record, Article):
+        title = record.title
+        header = f"Article: {record.title} (category: {record.category or 'general'})"
+        body = record.content
+    elif isinstance(record, PromotionalEvent):
+        title = record.event_name
+        start = record.event_start_date.strftime('%Y-%m-%d') if record.event_start_date else "date to be announced"
+        header = f"Event: {record.event_name} on {start} at {record.location or 'location to be announced'}"
+        body = record.event_description
+    elif isinstance(record, Solution):
+        title = record.title
+        header = f"Solution: {record.title} (industry: {record.industry or 'general'})"
+        body = f"{record.description or ''} Key features: {record.key_features or ''}"
+    else:
+        raise TypeError(f"Cannot index records of type {type(record).__name__}")
+
+    return [
+        Chunk(f"{kind}:{record_id}:{n}", kind, record_id, title, f"{header}\n{passage}".strip())
+        for n, passage in enumerate(_split_words(body))
+    ]
+
+
+def chunks_for_company_context(context):
+    """Split the company_context.json document into one chunk per section or list item"""
+    chunks = []
+    for section, value in context.items():
+        items = value if isinstance(value, list) else [value]
+        for n, item in enumerate(items):
+            if isinstance(item, dict):
+                title = item.get('name') or item.get('question') or section
+                body = json.dumps(item)
+            else:
+                title = section
+                body = item if isinstance(item, str) else json.dumps(item)
+            text = f"{section.replace('_', ' ').title()}: {body}"
+            chunks.append(Chunk(f"company_context:{section}:{n}", "company_context", section, title, text))
+    return chunks
+
+
+def load_company_context():
+    """Load company-specific information from the JSON file"""
+    with open(Path(Config.COMPANY_CONTEXT_PATH), 'r') as f:
+        return json.load(f)
@@ -0,0 +1,59 @@
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import make_response, request
+from app.services.versioning import versions
+
+
+def validators(collections, schedule=None):
+    """Strong ETag and Last-Modified for a response built from `collections`.
+
+    Both come from the collection_version rows, one primary-key lookup per
+    collection. `schedule`, for content that also changes with time, returns a
+    token to mix into the ETag and when the content last changed by itself.
+    """
+    stamp, last_modified = versions.state(collections)
+    if schedule is not None:
+        token, changed_at = schedule()
+        stamp = f"{stamp}:{token}"
+        if changed_at is not None:
+            last_modified = max(last_modified, changed_at.replace(tzinfo=timezone.utc))
+    etag = hashlib.sha1(stamp.encode("utf-8")).hexdigest()[:20]
+    return etag, last_modified.replace(microsecond=0)
+
+
+def is_not_modified(etag, last_modified):
+    """Apply If-None-Match, or If-Modified-Since when no ETag was sent"""
+    if request.if_none_match:
+        # Compressed responses carry the ETag with an encoding suffix, e.g. "abc-gzip"
+        return request.if_none_match.star_tag or any(
+            tag == etag or tag.startswith(f"{etag}-") for tag in request.if_none_match.as_set()
+        )
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional_get(*collections, schedule=None):
+    """Serve 304 Not Modified without running the view while `collections` are unchanged.
+
+    Validators are read before the view runs, so a write that lands mid-request can
+    only make the next request miss, never pin a stale body to a new ETag.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = validators(collections, schedule)
+            if is_not_modified(etag, last_modified):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            # Browsers may keep the body but must check back before reusing it
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,182 @@
+import threading
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app.models.models import db, ChatMessage, ConversationSummary
+
+Turn = namedtuple("Turn", ["message_id", "question", "answer"])
+
+# Long answers are clipped when replayed so one verbose turn cannot blow up the prompt
+MAX_TURN_CHARS = 600
+
+SUMMARY_PROMPT = """Update the running summary of a customer's conversation with our assistant.
+Keep facts the customer shared, what they asked about and any open questions.
+Write at most {max_chars} characters of plain prose.
+
+CURRENT SUMMARY:
+{summary}
+
+NEW TURNS:
+{turns}
+
+UPDATED SUMMARY:"""
+
+
+def _clip(text, limit=MAX_TURN_CHARS):
+    text = text or ""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def format_turns(turns):
+    return "\n".join(f"User: {_clip(t.question)}\nAssistant: {_clip(t.answer)}" for t in turns)
+
+
+class _Conversation:
+    def __init__(self, summary, summarized_through_id, turns):
+        self.summary = summary
+        self.summarized_through_id = summarized_through_id
+        self.turns = deque(turns)
+        self.compacting = False
+        # Newest answered message this copy has seen; a newer one in the database means
+        # another worker recorded a turn and this copy is out of date
+        self.last_message_id = max([summarized_through_id] + [t.message_id for t in turns])
+
+
+class ConversationMemory:
+    """Per-user chat history: the last `window_turns` turns verbatim plus a rolling summary.
+
+    When a conversation grows past the window, the oldest turns are folded into the
+    summary in the background, so the history part of the prompt stays roughly the
+    same size however long the conversation runs. Recently active conversations are
+    kept in an LRU. Each use checks the newest answered message id (one indexed row)
+    so turns recorded by other workers are picked up rather than missed.
+    """
+
+    def __init__(self, summarize, window_turns=6, max_summary_chars=1500, max_users=1000):
+        self.summarize = summarize
+        self.window_turns = window_turns
+        self.max_summary_chars = max_summary_chars
+        self.max_users = max_users
+        self._lock = threading.Lock()
+        self._conversations = OrderedDict()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-summary")
+
+    def _load(self, user_id):
+        """Read a conversation from the database; must run inside an app context.
+
+        Every turn after the summary is loaded, not just the window: turns older than
+        the window that were never summarized (say a compaction failed) are folded into
+        the summary on the next recorded turn rather than silently dropped.
+        """
+        row = db.session.get(ConversationSummary, user_id)
+        summary = row.summary if row else ""
+        summarized_through_id = row.summarized_through_id if row else 0
+        messages = (
+            ChatMessage.query
+            .filter(ChatMessage.user_id == user_id,
+                    ChatMessage.id > summarized_through_id,
+                    ChatMessage.response.isnot(None))
+            .order_by(ChatMessage.created_at, ChatMessage.id)
+            .all()
+        )
+        turns = [Turn(m.id, m.content, m.response) for m in messages]
+        return _Conversation(summary, summarized_through_id, turns)
+
+    def _latest_message_id(self, user_id):
+        return (
+            db.session.query(ChatMessage.id)
+            .filter(ChatMessage.user_id == user_id, ChatMessage.response.isnot(None))
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(1)
+            .scalar()
+        ) or 0
+
+    def _get(self, user_id, seen_message_id=0):
+        """Return the cached conversation, reloading it if the database has newer turns.
+
+        `seen_message_id` is a turn the caller already holds, so it does not count as
+        something this copy is missing.
+        """
+        latest = self._latest_message_id(user_id)
+        with self._lock:
+            conversation = self._conversations.get(user_id)
+            if conversation is not None and max(conversation.last_message_id, seen_message_id) >= latest:
+                self._conversations.move_to_end(user_id)
+                return conversation
+
+        conversation = self._load(user_id)
+        with self._lock:
+            cached = self._conversations.get(user_id)
+            # Another request may have loaded it meanwhile; keep whichever copy is newer
+            if cached is not None and cached.last_message_id >= conversation.last_message_id:
+                conversation = cached
+            self._conversations[user_id] = conversation
+            self._conversations.move_to_end(user_id)
+            while len(self._conversations) > self.max_users:
+                self._conversations.popitem(last=False)
+        return conversation
+
+    def context_for(self, user_id):
+        """Return (summary, recent turns) for a user's conversation"""
+        conversation = self._get(user_id)
+        with self._lock:
+            return conversation.summary, list(conversation.turns)[-self.window_turns:]
+
+    def record_turn(self, user_id, message_id, question, answer):
+        """Append a completed turn and compact the conversation if it outgrew the window"""
+        # The answer is already stored, so it is always newer than the cached copy;
+        # only turns recorded by other workers should force a reload
+        conversation = self._get(user_id, seen_message_id=message_id)
+        with self._lock:
+            conversation.last_message_id = max(conversation.last_message_id, message_id)
+            if any(turn.message_id == message_id for turn in conversation.turns):
+                # Already reloaded from the database along with other workers' turns
+                return
+            conversation.turns.append(Turn(message_id, question, answer))
+            if conversation.compacting or len(conversation.turns) <= self.window_turns:
+                return
+            overflow = [conversation.turns.popleft()
+                        for _ in range(len(conversation.turns) - self.window_turns)]
+            conversation.compacting = True
+            summary = conversation.summary
+
+        app = current_app._get_current_object()
+        self._compactor.submit(self._compact, app, user_id, conversation, summary, overflow)
+
+    def _compact(self, app, user_id, conversation, summary, overflow):
+        try:
+            new_summary = self._summarize(summary, overflow)
+            summarized_through_id = overflow[-1].message_id
+            with app.app_context():
+                row = db.session.get(ConversationSummary, user_id)
+                if row is None:
+                    row = ConversationSummary(user_id=user_id)
+                    db.session.add(row)
+                row.summary = new_summary
+                row.summarized_through_id = summarized_through_id
+                db.session.commit()
+            with self._lock:
+                conversation.summary = new_summary
+                conversation.summarized_through_id = summarized_through_id
+        except Exception as e:
+            print(f"Error compacting conversation for user {user_id}: {str(e)}")
+            with self._lock:
+                conversation.turns.extendleft(reversed(overflow))
+        finally:
+            with self._lock:
+                conversation.compacting = False
+
+    def _summarize(self, summary, turns):
+        """Ask the model for a new summary, falling back to a clipped transcript"""
+        try:
+            new_summary = self.summarize(SUMMARY_PROMPT.format(
+                max_chars=self.max_summary_chars,
+                summary=summary or "(none yet)",
+                turns=format_turns(turns),
+            ))
+        except Exception as e:
+            print(f"Error summarizing conversation: {str(e)}")
+            new_summary = None
+        if not new_summary:
+            new_summary = "\n".join(filter(None, [summary] + [f"User asked: {_clip(t.question, 200)}" for t in turns]))
+        return new_summary.strip()[-self.max_summary_chars:]
@@ -0,0 +1,122 @@
+from datetime import datetime
+from sqlalchemy import event, func, select, update
+from app.models.models import db, User, ContactInquiry, Article, PromotionalEvent, SummaryCounters
+from app.services.versioning import VERSIONED_COLLECTIONS, versions
+
+COUNTER_ROW_ID = 1
+
+# Models whose row count is mirrored in a SummaryCounters column
+COUNTED = {
+    User: 'users',
+    ContactInquiry: 'inquiries',
+    Article: 'articles',
+}
+
+
+def _upcoming_values(connection):
+    """Current upcoming-event count and the moment it next changes by itself"""
+    count, next_start = connection.execute(
+        select(func.count(PromotionalEvent.id), func.min(PromotionalEvent.event_start_date))
+        .where(PromotionalEvent.upcoming)
+    ).one()
+    return {'upcoming_events': count, 'upcoming_valid_until': next_start}
+
+
+def _apply_changes(session, flush_context):
+    """Fold this flush's writes into the counters row and collection versions, in the same transaction"""
+    deltas = {}
+    changed = set()
+    for objects, step in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            column = COUNTED.get(type(obj))
+            if column is not None:
+                deltas[column] = deltas.get(column, 0) + step
+            changed.add(getattr(obj, '__tablename__', None))
+    changed.update(
+        getattr(obj, '__tablename__', None) for obj in session.dirty
+        if getattr(obj, '__tablename__', None) in VERSIONED_COLLECTIONS and session.is_modified(obj)
+    )
+    events_changed = 'promotional_event' in changed
+
+    connection = session.connection()
+    bumped = changed.intersection(VERSIONED_COLLECTIONS)
+    if bumped:
+        versions.bump_in(connection, bumped)
+
+    values = {column: getattr(SummaryCounters, column) + delta for column, delta in deltas.items() if delta}
+    if events_changed:
+        # Upcoming depends on dates and flags, not just inserts; the indexed recount is cheap
+        values.update(_upcoming_values(connection))
+    if values:
+        values['updated_at'] = datetime.utcnow()
+        connection.execute(
+            update(SummaryCounters).where(SummaryCounters.id == COUNTER_ROW_ID).values(**values)
+        )
+
+
+def init_counters():
+    """Keep SummaryCounters and collection versions current on every flush of the app's session"""
+    if not event.contains(db.session, 'after_flush', _apply_changes):
+        event.listen(db.session, 'after_flush', _apply_changes)
+
+
+def _live_counts():
+    return {
+        'total_users': User.query.count(),
+        'total_inquiries': ContactInquiry.query.count(),
+        'total_articles': Article.query.count(),
+        'upcoming_events': PromotionalEvent.query.filter(PromotionalEvent.upcoming).count(),
+    }
+
+
+def overview():
+    """Dashboard totals from the counters row.
+
+    Normally a single primary-key read. Once the soonest upcoming event has started
+    the stored upcoming count is stale, so that one figure is recounted (from the
+    event_start_date index) until an event changes or the counters are refreshed.
+    """
+    row = db.session.get(SummaryCounters, COUNTER_ROW_ID)
+    if row is None:
+        return _live_counts()
+    totals = {
+        'total_users': row.users,
+        'total_inquiries': row.inquiries,
+        'total_articles': row.articles,
+        'upcoming_events': row.upcoming_events,
+    }
+    if row.upcoming_valid_until is not None and row.upcoming_valid_until < datetime.utcnow():
+        totals['upcoming_events'] = PromotionalEvent.query.filter(PromotionalEvent.upcoming).count()
+    return totals
+
+
+def refresh_upcoming():
+    """Recount upcoming events, e.g. after the sweep has moved started events to past"""
+    db.session.execute(
+        update(SummaryCounters).where(SummaryCounters.id == COUNTER_ROW_ID)
+        .values(updated_at=datetime.utcnow(), **_upcoming_values(db.session.connection()))
+    )
+    db.session.commit()
+
+
+def reconcile():
+    """Recount every counter from its table and fix any drift.
+
+    The counters row is locked first, so writers wait and nothing is counted twice.
+    Returns {counter: (stored, actual)} for the counters that were wrong.
+    """
+    row = db.session.get(SummaryCounters, COUNTER_ROW_ID, with_for_update=True)
+    if row is None:
+        row = SummaryCounters(id=COUNTER_ROW_ID)
+        db.session.add(row)
+    actual = {column: db.session.query(func.count(model.id)).scalar() for model, column in COUNTED.items()}
+    actual.update(_upcoming_values(db.session.connection()))
+
+    drift = {}
+    for column, value in actual.items():
+        stored = getattr(row, column)
+        if stored != value and column != 'upcoming_valid_until':
+            drift[column] = (stored, value)
+        setattr(row, column, value)
+    db.session.commit()
+    return drift
@@ -0,0 +1,56 @@
+import importlib
+import math
+import zlib
+from collections import Counter
+import numpy as np
+from app.services.chunking import tokenize
+
+
+class HashingEmbedder:
+    """Offline embedder that hashes unigrams and bigrams into a fixed-size vector.
+
+    Term weights are sublinear (1 + log tf) and every vector is L2-normalised,
+    so a dot product between two embeddings is their cosine similarity.
+    """
+
+    name = "hashing"
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+
+    def _features(self, text):
+        terms = tokenize(text)
+        return terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+    def embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, tf in Counter(self._features(text)).items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign * (1.0 + math.log(tf))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts):
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self.embed(text) for text in texts])
+
+
+EMBEDDERS = {
+    'hashing': HashingEmbedder,
+}
+
+
+def get_embedder(name, dim):
+    """Return an embedder by registered name or by 'package.module:ClassName' path.
+
+    Custom embedders need a `name` and `dim` attribute plus `embed(text)` and
+    `embed_many(texts)` methods returning float32 unit vectors.
+    """
+    if name in EMBEDDERS:
+        return EMBEDDERS[name](dim=dim)
+    module_name, _, class_name = name.partition(':')
+    if not class_name:
+        raise ValueError(f"Unknown embedder '{name}'")
+    return getattr(importlib.import_module(module_name), class_name)(dim=dim)
@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.models.models import db, ChatMessage, ContactInquiry, CustomerFeedback, User
+
+# Rows fetched per round trip from the server-side cursor
+BATCH_SIZE = 1000
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _contacts():
+    columns = [getattr(ContactInquiry, c.name) for c in ContactInquiry.__table__.columns]
+    return select(*columns), ContactInquiry.submission_date, ContactInquiry.id
+
+
+def _feedback():
+    query = (
+        select(CustomerFeedback.id, CustomerFeedback.customer_id, User.username.label('customer_name'),
+               CustomerFeedback.feedback_text, CustomerFeedback.rating, CustomerFeedback.feedback_date)
+        .outerjoin(User, User.id == CustomerFeedback.customer_id)
+    )
+    return query, CustomerFeedback.feedback_date, CustomerFeedback.id
+
+
+def _chat():
+    query = (
+        select(ChatMessage.id, ChatMessage.user_id, User.username, ChatMessage.content,
+               ChatMessage.response, ChatMessage.status, ChatMessage.created_at)
+        .outerjoin(User, User.id == ChatMessage.user_id)
+    )
+    return query, ChatMessage.created_at, ChatMessage.id
+
+
+EXPORTS = {
+    'contacts': _contacts,
+    'feedback': _feedback,
+    'chat': _chat,
+}
+
+
+def parse_date(value, end=False):
+    """ISO date or datetime; a bare date used as an end bound covers that whole day"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def iter_rows(name, start=None, end=None):
+    """Yield (column names, row iterator) streamed from a server-side cursor.
+
+    `start` is inclusive and `end` exclusive. Rows come in id order.
+    """
+    query, date_column, id_column = EXPORTS[name]()
+    if start is not None:
+        query = query.where(date_column >= start)
+    if end is not None:
+        query = query.where(date_column < end)
+    result = db.session.execute(query.order_by(id_column).execution_options(yield_per=BATCH_SIZE))
+    return list(result.keys()), result
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode(columns, rows, fmt):
+    """Yield text in chunks of about BATCH_SIZE rows"""
+    buffer = io.StringIO()
+    if fmt == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        write = lambda row: writer.writerow(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+        )
+    else:
+        write = lambda row: buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n")
+
+    for n, row in enumerate(rows, 1):
+        write(row)
+        if n % BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_export(name, fmt='csv', start=None, end=None, compress=False):
+    """Yield the export as bytes, optionally as a gzip stream; memory stays flat however many rows"""
+    columns, rows = iter_rows(name, start, end)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    for text in _encode(columns, rows, fmt):
+        data = text.encode("utf-8")
+        if compressor is not None:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def filename_for(name, fmt, compress=False):
+    return f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}" + (".gz" if compress else "")
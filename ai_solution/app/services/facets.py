@@ -0,0 +1,14 @@
+from sqlalchemy import func
+from app.models.models import db
+
+
+def facet_counts(column):
+    """Per-value row counts for a column in one grouped query, most common first; NULL is None"""
+    count = func.count()
+    rows = (
+        db.session.query(column, count)
+        .group_by(column)
+        .order_by(count.desc(), column)
+        .all()
+    )
+    return [{'value': value, 'count': n} for value, n in rows]
@@ -0,0 +1,105 @@
+import time
+from datetime import datetime, timedelta
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, producing the same documents as the default.
+
+    Datetimes are passed through to Flask's own default handler, so they keep the
+    HTTP-date format the frontend already parses. Keys stay sorted. Non-ASCII text is
+    sent as UTF-8 rather than \\u escapes. Anything orjson rejects (such as integers
+    wider than 64 bits) falls back to the standard library encoder.
+    """
+
+    def _options(self, indent=False):
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def _dump_bytes(self, obj, indent=False):
+        try:
+            return orjson.dumps(obj, default=_default, option=self._options(indent))
+        except orjson.JSONEncodeError:
+            kwargs = {"indent": 2} if indent else {"separators": (",", ":")}
+            return super().dumps(obj, **kwargs).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        # Extra stdlib options (cls, ensure_ascii, ...) have no orjson equivalent
+        if set(kwargs) - {"indent", "separators"}:
+            return super().dumps(obj, **kwargs)
+        return self._dump_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dump_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
+
+
+def select_json_provider(name):
+    """Provider class for JSON_PROVIDER: 'orjson', 'default', or 'auto' (orjson when installed)"""
+    if name == 'default' or (name == 'auto' and orjson is None):
+        return DefaultJSONProvider
+    if orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson requires the 'orjson' package")
+    return OrjsonProvider
+
+
+def sample_payload(rows=1000):
+    """Rows shaped like the contact inquiry listing, the largest regular API response"""
+    started = datetime(2024, 1, 1)
+    return [
+        {
+            'id': n,
+            'full_name': f"Customer {n}",
+            'email': f"customer{n}@example.com",
+            'phone_number': "+1 555 0100",
+            'company_name': f"Company {n % 97}",
+            'country': "Australia",
+            'job_title': "Operations Manager",
+            'job_details': "Responsible for day to day operations and vendor management. " * 3,
+            'company_location': "Sydney",
+            'interested_product': "AI Chatbot",
+            'current_solution': "Spreadsheets and email",
+            'inquiry_reason': "Looking to automate first-line support for our customers.",
+            'submission_date': started + timedelta(minutes=n),
+            'status': "Pending",
+        }
+        for n in range(rows)
+    ]
+
+
+def benchmark(app, payload, repeat=20):
+    """Time encoding `payload` with each available provider and measure bytes on the wire"""
+    from app.services.compression import brotli, compress
+
+    results = []
+    for provider_class in filter(None, [DefaultJSONProvider, OrjsonProvider if orjson else None]):
+        provider = provider_class(app)
+        with app.app_context():
+            body = provider.response(payload).get_data()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                provider.response(payload).get_data()
+            elapsed = (time.perf_counter() - started) / repeat
+        results.append({
+            'provider': provider_class.__name__,
+            'encode_ms': elapsed * 1000,
+            'bytes': len(body),
+            'gzip_bytes': len(compress(body, 'gzip')),
+            'br_bytes': len(compress(body, 'br')) if brotli is not None else None,
+        })
+    return results
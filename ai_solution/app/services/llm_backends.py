@@ -0,0 +1,180 @@
+import abc
+import hashlib
+import importlib
+import math
+import random
+import threading
+import time
+from app.config import Config
+
+
+class LLMBackendError(Exception):
+    """Raised when a backend fails to produce a response"""
+
+
+class ContentBlockedError(LLMBackendError):
+    """Raised when the model refuses the prompt or stops a response for safety; retrying cannot help"""
+
+
+class LLMBackend(abc.ABC):
+    """Interface for the text-generation model behind ChatbotService"""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def generate(self, prompt: str, timeout: float = None) -> str:
+        """Return the complete response text for a prompt, raising TimeoutError after `timeout` seconds"""
+
+    @abc.abstractmethod
+    def stream(self, prompt: str):
+        """Yield response text in pieces; closing the generator early must stop the upstream call"""
+
+
+def _gemini_text(response):
+    """Text of a Gemini response or stream chunk.
+
+    The SDK's `.text` raises ValueError when a chunk carries no parts, which happens
+    both for blocked prompts and for an empty closing chunk; tell the two apart.
+    """
+    candidates = getattr(response, 'candidates', None) or []
+    content = getattr(candidates[0], 'content', None) if candidates else None
+    if content is not None and content.parts:
+        return "".join(getattr(part, 'text', '') for part in content.parts)
+    feedback = getattr(response, 'prompt_feedback', None)
+    if not candidates and getattr(feedback, 'block_reason', None):
+        raise ContentBlockedError(f"Prompt blocked: {feedback.block_reason}")
+    if candidates:
+        finish_reason = getattr(candidates[0].finish_reason, 'name', str(candidates[0].finish_reason))
+        if finish_reason not in ('STOP', 'MAX_TOKENS', 'FINISH_REASON_UNSPECIFIED'):
+            raise ContentBlockedError(f"Response stopped: {finish_reason}")
+    return ""
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini via the google-generativeai SDK"""
+
+    name = "gemini"
+
+    def __init__(self, api_key, model_name="gemini-1.5-flash"):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt: str, timeout: float = None) -> str:
+        # Initialize chat with system prompt
+        chat = self.model.start_chat(history=[])
+        request_options = {"timeout": timeout} if timeout else None
+        return _gemini_text(chat.send_message(prompt, request_options=request_options))
+
+    def stream(self, prompt: str):
+        response = self.model.generate_content(prompt, stream=True)
+        completed = False
+        try:
+            for chunk in response:
+                text = _gemini_text(chunk)
+                if text:
+                    yield text
+            completed = True
+        finally:
+            if not completed:
+                # The SDK has no public cancel; the gRPC stream iterator it wraps does
+                cancel = getattr(getattr(response, '_iterator', None), 'cancel', None)
+                if cancel is not None:
+                    cancel()
+
+
+class FakeBackend(LLMBackend):
+    """Local stand-in for load tests and offline development.
+
+    Time to first token is drawn from a log-normal distribution with the given
+    median and shape, after which tokens arrive at `tokens_per_second`. A random
+    `failure_rate` fraction of calls raise LLMBackendError. The response text is a
+    deterministic function of the prompt, so caching and coalescing behave as they
+    would against the real model.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency_ms=800, latency_sigma=0.5, tokens_per_second=50,
+                 response_tokens=60, failure_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        with self._lock:
+            latency = self._random.lognormvariate(math.log(self.latency_ms / 1000.0), self.latency_sigma)
+            failed = self._random.random() < self.failure_rate
+        return latency, failed
+
+    def _tokens(self, prompt):
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        words = [digest[i:i + 4] for i in range(0, len(digest), 4)]
+        return ["[fake]"] + [words[i % len(words)] for i in range(self.response_tokens - 1)]
+
+    def generate(self, prompt: str, timeout: float = None) -> str:
+        latency, failed = self._draw()
+        tokens = self._tokens(prompt)
+        duration = latency + len(tokens) / self.tokens_per_second
+        if timeout is not None and duration > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Simulated backend timeout")
+        time.sleep(duration)
+        if failed:
+            raise LLMBackendError("Simulated backend failure")
+        return " ".join(tokens)
+
+    def stream(self, prompt: str):
+        latency, failed = self._draw()
+        time.sleep(latency)
+        if failed:
+            raise LLMBackendError("Simulated backend failure")
+        for n, token in enumerate(self._tokens(prompt)):
+            time.sleep(1.0 / self.tokens_per_second)
+            yield token if n == 0 else " " + token
+
+
+def create_llm_backend():
+    """Build the backend selected by LLM_BACKEND, wrapped in the retry/breaker layer"""
+    from app.services.resilience import CircuitBreaker, ResilientBackend
+
+    return ResilientBackend(
+        _create_base_backend(),
+        call_timeout=Config.LLM_CALL_TIMEOUT,
+        total_timeout=Config.LLM_TOTAL_TIMEOUT,
+        max_retries=Config.LLM_MAX_RETRIES,
+        base_delay=Config.LLM_RETRY_BASE_DELAY,
+        max_delay=Config.LLM_RETRY_MAX_DELAY,
+        hedge_percentile=Config.LLM_HEDGE_PERCENTILE,
+        breaker=CircuitBreaker(
+            failure_threshold=Config.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=Config.LLM_BREAKER_RESET_TIMEOUT,
+        ),
+    )
+
+
+def _create_base_backend():
+    """Build the raw backend selected by LLM_BACKEND ('gemini', 'fake' or 'package.module:ClassName')"""
+    if Config.LLM_BACKEND == 'gemini':
+        return GeminiBackend(Config.GEMINI_API_KEY, Config.GEMINI_MODEL)
+    if Config.LLM_BACKEND == 'fake':
+        return FakeBackend(
+            latency_ms=Config.FAKE_LLM_LATENCY_MS,
+            latency_sigma=Config.FAKE_LLM_LATENCY_SIGMA,
+            tokens_per_second=Config.FAKE_LLM_TOKENS_PER_SECOND,
+            response_tokens=Config.FAKE_LLM_RESPONSE_TOKENS,
+            failure_rate=Config.FAKE_LLM_FAILURE_RATE,
+            seed=Config.FAKE_LLM_SEED,
+        )
+    module_name, _, class_name = Config.LLM_BACKEND.partition(':')
+    if not class_name:
+        raise ValueError(f"Unknown LLM_BACKEND '{Config.LLM_BACKEND}'")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(backend_class, type) and issubclass(backend_class, LLMBackend)):
+        raise TypeError(f"LLM_BACKEND '{Config.LLM_BACKEND}' is not an LLMBackend subclass")
+    return backend_class()
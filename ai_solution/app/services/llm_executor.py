@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import Config
+
+
+class LLMSaturatedError(Exception):
+    """Raised when no LLM slot frees up within the queue-wait timeout"""
+
+
+class BoundedExecutor:
+    """Dedicated thread pool for model calls with a hard cap on in-flight requests.
+
+    A caller waits at most `queue_timeout` seconds for a free slot and then gets
+    LLMSaturatedError, so a backlog of slow generations turns into fast 503s
+    instead of tying up every web worker thread.
+    """
+
+    def __init__(self, max_in_flight, queue_timeout):
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="llm")
+
+    def acquire_slot(self):
+        """Reserve an in-flight slot or raise LLMSaturatedError"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise LLMSaturatedError("Too many chat requests in flight")
+        with self._lock:
+            self.in_flight += 1
+
+    def release_slot(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn on the LLM pool and return a concurrent.futures.Future"""
+        self.acquire_slot()
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self.release_slot()
+            raise
+        future.add_done_callback(lambda _: self.release_slot())
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn on the LLM pool without blocking the caller's event loop during the call"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self):
+        return {
+            'max_in_flight': self.max_in_flight,
+            'in_flight': self.in_flight,
+            'rejected': self.rejected,
+        }
+
+
+llm_executor = BoundedExecutor(Config.LLM_MAX_IN_FLIGHT, Config.LLM_QUEUE_TIMEOUT)
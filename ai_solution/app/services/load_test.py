@@ -0,0 +1,101 @@
+import itertools
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+DEFAULT_MESSAGES = [
+    "What products do you offer?",
+    "When is the next event?",
+    "Tell me about Turbo Farm",
+    "How can your chatbot help my support team?",
+    "Can your solutions integrate with our ERP system?",
+]
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(p / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_load_test(url, rps, duration, concurrency=64, messages=None, timeout=30.0):
+    """Drive POST requests at `url` at a fixed arrival rate and summarise the results.
+
+    Requests are scheduled open-loop: each one is due at a fixed time regardless of
+    how earlier ones are doing, and its latency is measured from that due time.
+    Queueing inside the client is therefore charged to the server, rather than
+    hidden by a client that slows down when the server does.
+    """
+    messages = itertools.cycle(messages or DEFAULT_MESSAGES)
+    results = []
+    results_lock = threading.Lock()
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def fire(due, message):
+        outcome = None
+        try:
+            response = session.post(url, json={"message": message}, timeout=timeout)
+            outcome = str(response.status_code)
+        except requests.RequestException as e:
+            outcome = type(e).__name__
+        latency = time.perf_counter() - due
+        with results_lock:
+            results.append((outcome, latency))
+
+    total = int(rps * duration)
+    interval = 1.0 / rps
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for n in range(total):
+            due = start + n * interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, due, next(messages))
+    elapsed = time.perf_counter() - start
+
+    outcomes = Counter(outcome for outcome, _ in results)
+    ok_latencies = sorted(latency for outcome, latency in results if outcome.startswith("2"))
+    all_latencies = sorted(latency for _, latency in results)
+    errors = sum(count for outcome, count in outcomes.items() if not outcome.startswith("2"))
+    return {
+        'requests': len(results),
+        'target_rps': rps,
+        'elapsed_seconds': elapsed,
+        'throughput_rps': len(results) / elapsed if elapsed else 0.0,
+        'successful_rps': len(ok_latencies) / elapsed if elapsed else 0.0,
+        'error_rate': errors / len(results) if results else 0.0,
+        'outcomes': dict(outcomes),
+        'latency_ms': {
+            name: {
+                'p50': percentile(values, 50) * 1000,
+                'p95': percentile(values, 95) * 1000,
+                'p99': percentile(values, 99) * 1000,
+                'max': (values[-1] if values else 0.0) * 1000,
+            }
+            for name, values in (('all', all_latencies), ('successful', ok_latencies))
+        },
+    }
+
+
+def format_report(report):
+    lines = [
+        f"Requests:    {report['requests']} in {report['elapsed_seconds']:.1f}s "
+        f"(target {report['target_rps']} rps)",
+        f"Throughput:  {report['throughput_rps']:.1f} rps, {report['successful_rps']:.1f} rps successful",
+        f"Error rate:  {report['error_rate']:.2%}",
+        "Outcomes:    " + ", ".join(f"{k}={v}" for k, v in sorted(report['outcomes'].items())),
+    ]
+    for name, latency in report['latency_ms'].items():
+        lines.append(
+            f"Latency ({name}): p50={latency['p50']:.0f}ms p95={latency['p95']:.0f}ms "
+            f"p99={latency['p99']:.0f}ms max={latency['max']:.0f}ms"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,258 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; spans cache hits (sub-millisecond) through slow model calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Characters; prompts carry the whole company context so they run large
+SIZE_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (Jain & Chlamtac's P² algorithm).
+
+    Five markers track the minimum, the target quantile, the maximum and two points
+    in between; each observation nudges their heights along a parabola instead of
+    storing the sample.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self._initial = []
+        self.heights = None
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        if self.heights is None:
+            self._initial.append(x)
+            if len(self._initial) == 5:
+                self.heights = sorted(self._initial)
+            return
+
+        q, n = self.heights, self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        if self.heights is not None:
+            return self.heights[2]
+        if not self._initial:
+            return math.nan
+        ordered = sorted(self._initial)
+        return ordered[min(len(ordered) - 1, int(self.p * len(ordered)))]
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _child(self, labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return key, child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(list(zip(self.labelnames, key)), child))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return [0]
+
+    def inc(self, amount=1, **labels):
+        _, child = self._child(labels)
+        with self._lock:
+            child[0] += amount
+
+    def _render_child(self, labels, child):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(child[0])}"]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts plus sum; cheap to update and aggregatable across workers"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self):
+        return {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+
+    def observe(self, value, **labels):
+        _, child = self._child(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child['counts'][index] += 1
+            child['sum'] += value
+
+    def _render_child(self, labels, child):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child['counts']):
+            cumulative += count
+            le = _format_labels(labels + [("le", _format_value(float(bound)))])
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(child['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Summary(_Metric):
+    """Count, sum and P² quantile estimates since the process started"""
+
+    kind = "summary"
+
+    def __init__(self, name, documentation, labelnames=(), quantiles=(0.5, 0.95, 0.99)):
+        super().__init__(name, documentation, labelnames)
+        self.quantiles = tuple(quantiles)
+
+    def _new_child(self):
+        return {'estimators': [P2Quantile(q) for q in self.quantiles], 'count': 0, 'sum': 0.0}
+
+    def observe(self, value, **labels):
+        _, child = self._child(labels)
+        with self._lock:
+            for estimator in child['estimators']:
+                estimator.add(value)
+            child['count'] += 1
+            child['sum'] += value
+
+    def _render_child(self, labels, child):
+        with self._lock:
+            values = [(q, estimator.value()) for q, estimator in zip(self.quantiles, child['estimators'])]
+            count, total = child['count'], child['sum']
+        lines = [
+            f"{self.name}{_format_labels(labels + [('quantile', str(q))])} {_format_value(value)}"
+            for q, value in values
+        ]
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Value read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def render(self):
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"Error reading gauge {self.name}: {str(e)}")
+            value = math.nan
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge",
+                f"{self.name} {_format_value(value)}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_seconds = registry.register(Histogram(
+    "chat_stage_duration_seconds", "Time spent in each stage of answering a chat message", ["stage"]))
+stage_quantiles = registry.register(Summary(
+    "chat_stage_latency_seconds", "Streaming p50/p95/p99 of each chat stage", ["stage"]))
+prompt_chars = registry.register(Histogram(
+    "chat_prompt_chars", "Size of prompts sent to the model", buckets=SIZE_BUCKETS))
+response_chars = registry.register(Histogram(
+    "chat_response_chars", "Size of answers returned to users", buckets=SIZE_BUCKETS))
+cache_requests = registry.register(Counter(
+    "chat_cache_requests_total", "Response cache lookups", ["result"]))
+errors = registry.register(Counter(
+    "chat_errors_total", "Chat failures by kind", ["kind"]))
+requests_total = registry.register(Counter(
+    "chat_requests_total", "Chat requests by endpoint and HTTP status", ["endpoint", "status"]))
+
+
+def observe_stage(stage, seconds):
+    stage_seconds.observe(seconds, stage=stage)
+    stage_quantiles.observe(seconds, stage=stage)
+
+
+@contextmanager
+def timed(stage):
+    """Record the duration of the with-block as a chat stage, including when it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
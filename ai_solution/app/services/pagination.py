@@ -0,0 +1,77 @@
+import base64
+import json
+from datetime import datetime
+from flask import abort, request
+from sqlalchemy import DateTime, tuple_
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not produced by encode_cursor"""
+
+
+def encode_cursor(values):
+    """Opaque, URL-safe cursor for the sort key of the last row on a page"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, columns):
+    """Turn a cursor back into typed sort-key values for `columns`"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of values")
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value is not None else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {str(e)}")
+
+
+def page_args(args, default_limit=50, max_limit=200):
+    """Read `limit` and `cursor` from request args, clamping the limit to [1, max_limit]"""
+    try:
+        limit = int(args.get("limit", default_limit))
+    except (TypeError, ValueError):
+        limit = default_limit
+    return max(1, min(limit, max_limit)), args.get("cursor") or None
+
+
+def keyset_page(query, columns, limit, cursor=None):
+    """Fetch one page of `query` in descending order of `columns`.
+
+    The last column must be unique (normally the primary key) so the order is total.
+    Rather than OFFSET, the page starts strictly after the row the cursor points at,
+    so with an index on `columns` each page costs the same however deep it is.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(tuple_(*columns) < tuple_(*decode_cursor(cursor, columns)))
+    rows = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], column.key) for column in columns])
+
+
+def paginate_request(query, id_column, default_limit=100, max_limit=500):
+    """Page a list endpoint's query newest-first using the current request's arguments.
+
+    Reads `limit`, `cursor` and `count=true` and returns (rows, headers), where headers
+    carry X-Next-Cursor when there is another page and X-Total-Count when asked for.
+    A request without `limit` gets the first `default_limit` rows; clients that want
+    the whole list follow X-Next-Cursor.
+    """
+    headers = {}
+    if request.args.get("count", "").lower() == "true":
+        headers["X-Total-Count"] = str(query.order_by(None).count())
+    limit, cursor = page_args(request.args, default_limit, max_limit)
+    try:
+        rows, next_cursor = keyset_page(query, [id_column], limit, cursor)
+    except InvalidCursor as e:
+        abort(400, description=str(e))
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return rows, headers
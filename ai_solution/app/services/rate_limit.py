@@ -0,0 +1,116 @@
+import math
+import threading
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from app.config import Config
+from app.models.models import db, ChatUsage
+from app.services.cache_backends import create_backend
+
+# Rough English average; good enough for budgeting without a tokenizer round trip
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text):
+    return max(1, math.ceil(len(text or "") / CHARS_PER_TOKEN))
+
+
+class RateLimited(Exception):
+    """Raised when a client has spent its token budget"""
+
+    def __init__(self, retry_after):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Token-bucket admission for chat requests, charged in estimated model tokens.
+
+    Each client (signed-in user or anonymous IP) has a bucket that refills at a steady
+    per-minute rate up to a burst size. Admission reserves the question's tokens plus
+    an expected response size; once the real answer is known, `settle` charges or
+    refunds the difference. Buckets live in the cache backend, so with
+    CACHE_BACKEND=redis every worker draws on the same budget.
+    """
+
+    def __init__(self, backend, tokens_per_minute=4000, burst_tokens=8000,
+                 anonymous_tokens_per_minute=1000, anonymous_burst_tokens=2000,
+                 response_estimate=300):
+        self.backend = backend
+        self.limits = {
+            'user': (burst_tokens, tokens_per_minute / 60.0),
+            'ip': (anonymous_burst_tokens, anonymous_tokens_per_minute / 60.0),
+        }
+        self.response_estimate = response_estimate
+        self.admitted = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _limits(self, client_key):
+        return self.limits[client_key.partition(':')[0]]
+
+    def admit(self, client_key, user_message):
+        """Reserve tokens for a request and return the amount, or raise RateLimited"""
+        capacity, rate = self._limits(client_key)
+        # A question bigger than the whole bucket could otherwise never be admitted
+        cost = min(capacity, estimate_tokens(user_message) + self.response_estimate)
+        taken, tokens = self.backend.take_tokens(client_key, cost, capacity, rate)
+        with self._lock:
+            if taken:
+                self.admitted += 1
+            else:
+                self.throttled += 1
+        if not taken:
+            raise RateLimited((cost - tokens) / rate)
+        return cost
+
+    def settle(self, client_key, reserved, used):
+        """Charge (or refund) the difference between the reservation and actual usage"""
+        if used != reserved:
+            capacity, rate = self._limits(client_key)
+            self.backend.take_tokens(client_key, used - reserved, capacity, rate, force=True)
+
+    def stats(self):
+        return {'admitted': self.admitted, 'throttled': self.throttled}
+
+
+def client_key_for(user, remote_addr):
+    """Rate-limit key: the user for signed-in callers, the IP address otherwise"""
+    if user.is_authenticated:
+        return f"user:{user.id}"
+    return f"ip:{remote_addr or 'unknown'}"
+
+
+def record_usage(client_key, user_id, tokens=0, throttled=False):
+    """Add one request to today's usage row for a client, in its own transaction"""
+    day = datetime.utcnow().date()
+    for _ in range(2):
+        try:
+            updated = ChatUsage.query.filter_by(day=day, client_key=client_key).update({
+                ChatUsage.requests: ChatUsage.requests + (0 if throttled else 1),
+                ChatUsage.tokens: ChatUsage.tokens + tokens,
+                ChatUsage.throttled: ChatUsage.throttled + (1 if throttled else 0),
+            }, synchronize_session=False)
+            if not updated:
+                db.session.add(ChatUsage(
+                    day=day,
+                    client_key=client_key,
+                    user_id=user_id,
+                    requests=0 if throttled else 1,
+                    tokens=tokens,
+                    throttled=1 if throttled else 0
+                ))
+            db.session.commit()
+            return
+        except IntegrityError:
+            # Another worker created today's row first; go round again and update it
+            db.session.rollback()
+
+
+admission = AdmissionController(
+    create_backend(),
+    tokens_per_minute=Config.RATE_LIMIT_TOKENS_PER_MINUTE,
+    burst_tokens=Config.RATE_LIMIT_BURST_TOKENS,
+    anonymous_tokens_per_minute=Config.RATE_LIMIT_ANONYMOUS_TOKENS_PER_MINUTE,
+    anonymous_burst_tokens=Config.RATE_LIMIT_ANONYMOUS_BURST_TOKENS,
+    response_estimate=Config.RATE_LIMIT_RESPONSE_ESTIMATE,
+)
@@ -0,0 +1,70 @@
+from datetime import datetime
+from sqlalchemy import func
+from app.models.models import db, CustomerFeedback, CustomerRatingSummary
+
+
+def _average(total, count):
+    return round(total / count, 2) if count else None
+
+
+def rating_stats(customer_id=None):
+    """Feedback count, rated count, average and 1-5 histogram from one grouped query"""
+    query = db.session.query(CustomerFeedback.rating, func.count()).group_by(CustomerFeedback.rating)
+    if customer_id is not None:
+        query = query.filter(CustomerFeedback.customer_id == customer_id)
+    histogram = {stars: 0 for stars in range(1, 6)}
+    feedback_count = 0
+    for rating, count in query:
+        feedback_count += count
+        if rating is not None:
+            histogram[rating] = count
+    rating_count = sum(histogram.values())
+    return {
+        'feedback_count': feedback_count,
+        'rating_count': rating_count,
+        'average': _average(sum(stars * n for stars, n in histogram.items()), rating_count),
+        'histogram': {str(stars): n for stars, n in histogram.items()},
+    }
+
+
+def _month(column):
+    if db.engine.dialect.name == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    return func.strftime('%Y-%m', column)
+
+
+def rating_trend(months=12, customer_id=None):
+    """Average rating and feedback volume per calendar month, oldest first, over the last `months` months"""
+    today = datetime.utcnow()
+    first = today.year * 12 + today.month - months
+    since = datetime(first // 12, first % 12 + 1, 1)
+    month = _month(CustomerFeedback.feedback_date)
+    query = (
+        db.session.query(month, func.count(), func.count(CustomerFeedback.rating), func.avg(CustomerFeedback.rating))
+        .filter(CustomerFeedback.feedback_date >= since)
+        .group_by(month)
+        .order_by(month)
+    )
+    if customer_id is not None:
+        query = query.filter(CustomerFeedback.customer_id == customer_id)
+    return [
+        {
+            'month': value,
+            'feedback_count': feedback_count,
+            'rating_count': rating_count,
+            'average': round(float(average), 2) if average is not None else None,
+        } for value, feedback_count, rating_count, average in query
+    ]
+
+
+def customer_summary(customer_id):
+    """A customer's rating totals from their maintained summary row, a single primary-key read"""
+    row = db.session.get(CustomerRatingSummary, customer_id)
+    histogram = {str(stars): getattr(row, f'rating_{stars}') if row else 0 for stars in range(1, 6)}
+    return {
+        'customer_id': customer_id,
+        'feedback_count': row.feedback_count if row else 0,
+        'rating_count': row.rating_count if row else 0,
+        'average': _average(row.rating_total, row.rating_count) if row else None,
+        'histogram': histogram,
+    }
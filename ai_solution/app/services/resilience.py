@@ -0,0 +1,235 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from app.services.llm_backends import ContentBlockedError, LLMBackend, LLMBackendError
+
+
+class CircuitOpenError(LLMBackendError):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+    def __init__(self, retry_after):
+        super().__init__("LLM backend is unavailable")
+        self.retry_after = retry_after
+
+
+def is_transient(error):
+    """True for failures worth retrying: timeouts, dropped connections, 429s and 5xx responses.
+
+    Permanent errors such as a blocked prompt, a rejected API key or a malformed
+    request fail the same way every time, so they are raised straight away.
+    """
+    if isinstance(error, (CircuitOpenError, ContentBlockedError)):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError, LLMBackendError)):
+        return True
+    # google.api_core and most HTTP clients expose the response status as `code` or `status_code`
+    status = getattr(error, 'code', None)
+    if not isinstance(status, int):
+        status = getattr(error, 'status_code', None)
+    return isinstance(status, int) and (status == 429 or 500 <= status < 600)
+
+
+class CircuitBreaker:
+    """Classic closed / open / half-open breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and calls fail
+    immediately. Once `reset_timeout` seconds have passed a single trial call is let
+    through (half-open); its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_after(self):
+        """Seconds until the breaker lets a trial call through, 0 if calls are allowed now"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                waited = time.monotonic() - self._opened_at
+                if waited < self.reset_timeout:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(self.reset_timeout - waited)
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self.short_circuited += 1
+                    raise CircuitOpenError(self.reset_timeout)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Percentiles over the most recent successful call latencies"""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p, min_samples=20):
+        with self._lock:
+            if len(self._samples) < min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+
+class ResilientBackend(LLMBackend):
+    """Wraps another backend with deadlines, retries, optional hedging and a circuit breaker.
+
+    Each attempt gets at most `call_timeout` seconds and the whole call at most
+    `total_timeout`. Failed attempts are retried up to `max_retries` times with
+    exponential backoff and full jitter; only transient errors are retried. With
+    `hedge_percentile` set, an attempt still running after that percentile of recent
+    latencies gets a second, parallel request, and whichever answers first wins.
+    The breaker sees one outcome per call, not per attempt.
+    """
+
+    def __init__(self, backend, call_timeout=20.0, total_timeout=45.0, max_retries=2,
+                 base_delay=0.5, max_delay=4.0, hedge_percentile=None, breaker=None):
+        self.backend = backend
+        self.name = backend.name
+        self.call_timeout = call_timeout
+        self.total_timeout = total_timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_percentile = hedge_percentile
+        self.breaker = breaker or CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.hedges = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm-hedge") if hedge_percentile else None
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def generate(self, prompt: str, timeout: float = None) -> str:
+        deadline = time.monotonic() + min(timeout or self.total_timeout, self.total_timeout)
+        last_error = None
+        self.breaker.before_call()
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
+            try:
+                response_text = self._attempt(prompt, min(self.call_timeout, deadline - started))
+            except Exception as e:
+                self._count('failures')
+                last_error = e
+                if not is_transient(e):
+                    # Upstream answered; the request itself is at fault
+                    self.breaker.record_success()
+                    raise LLMBackendError(f"LLM call failed: {e}") from e
+            else:
+                self.breaker.record_success()
+                self.latency.add(time.monotonic() - started)
+                return response_text
+
+            if attempt == self.max_retries:
+                break
+            backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            if time.monotonic() + backoff >= deadline:
+                break
+            self._count('retries')
+            time.sleep(backoff)
+        self.breaker.record_failure()
+        raise LLMBackendError(f"LLM call failed after retries: {last_error}") from last_error
+
+    def _attempt(self, prompt, timeout):
+        if timeout <= 0:
+            raise TimeoutError("LLM call deadline exceeded")
+        hedge_after = self.latency.percentile(self.hedge_percentile) if self.hedge_percentile else None
+        if hedge_after is None or hedge_after >= timeout:
+            return self.backend.generate(prompt, timeout=timeout)
+
+        started = time.monotonic()
+        pending = {self._hedge_pool.submit(self.backend.generate, prompt, timeout)}
+        done, pending = wait(pending, timeout=hedge_after)
+        if not done:
+            self._count('hedges')
+            pending.add(self._hedge_pool.submit(self.backend.generate, prompt, timeout - hedge_after))
+
+        last_error = None
+        try:
+            while True:
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                    last_error = future.exception()
+                if not pending:
+                    raise last_error
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    raise TimeoutError("LLM call deadline exceeded")
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        finally:
+            # The losing request is abandoned: dropped if it has not started, and its
+            # result or error is never looked at if it has
+            for future in pending:
+                future.cancel()
+
+    def stream(self, prompt: str):
+        # Retrying after tokens have been sent would duplicate output, so streams only
+        # get the breaker: fail fast when open, and report the outcome
+        self.breaker.before_call()
+        try:
+            yield from self.backend.stream(prompt)
+        except GeneratorExit:
+            self.breaker.record_success()
+            raise
+        except Exception as e:
+            if is_transient(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            self._count('failures')
+            raise
+        self.breaker.record_success()
+
+    def stats(self):
+        return {
+            'breaker_state': self.breaker.state,
+            'breaker_opened': self.breaker.times_opened,
+            'short_circuited': self.breaker.short_circuited,
+            'consecutive_failures': self.breaker.consecutive_failures,
+            'failures': self.failures,
+            'retries': self.retries,
+            'hedges': self.hedges,
+        }
@@ -0,0 +1,64 @@
+import hashlib
+import re
+import threading
+from app.services.cache_backends import create_backend
+from app.services.versioning import versions, RETRIEVAL_SOURCES
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(message):
+    """Lowercase, strip punctuation and collapse whitespace so trivial variants share an entry"""
+    message = _PUNCTUATION_RE.sub(" ", (message or "").lower())
+    return _WHITESPACE_RE.sub(" ", message).strip()
+
+
+class ResponseCache:
+    """Chat response cache keyed on the normalised question and the retrieval source versions.
+
+    Writes to articles, events or solutions bump their collection version, and the
+    company context is fingerprinted when it is loaded, so any change that could
+    alter an answer moves lookups to a fresh key. Stale entries are never read again
+    and age out through LRU eviction or TTL.
+    """
+
+    def __init__(self, backend, ttl, context_fingerprint=""):
+        self.backend = backend
+        self.ttl = ttl
+        self.context_fingerprint = context_fingerprint
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key_for(self, message):
+        """Build the cache key for a message against the current source versions"""
+        stamp = versions.stamp(RETRIEVAL_SOURCES)
+        raw = f"{normalize_message(message)}|{stamp}|{self.context_fingerprint}"
+        return "chat:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        response = self.backend.get(key)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def set(self, key, response):
+        self.backend.set(key, response, ttl=self.ttl)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.backend.evictions,
+            'entries': len(self.backend),
+        }
+
+
+def create_response_cache(context_fingerprint, ttl, max_entries):
+    return ResponseCache(create_backend(max_entries=max_entries), ttl, context_fingerprint)
@@ -0,0 +1,209 @@
+import heapq
+import math
+import threading
+from collections import Counter
+from app.models.models import Article, PromotionalEvent, Solution
+from app.services.chunking import (
+    tokenize, record_key, chunks_for_record, chunks_for_company_context,
+)
+from app.services.vector_store import vector_store
+from app.services.versioning import versions, RETRIEVAL_SOURCES
+
+# Reciprocal rank fusion constant; damps the weight of top ranks from either retriever
+RRF_K = 60
+
+
+class BM25Index:
+    """In-memory inverted index scored with Okapi BM25.
+
+    A query only walks the posting lists of its own terms, so lookup cost depends
+    on how many chunks share the query terms rather than on the size of the tables.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings = {}      # term -> {chunk key: term frequency}
+        self._chunks = {}        # chunk key -> (Chunk, length in terms)
+        self._by_record = {}     # record key -> [chunk keys]
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def add(self, chunk_record_key, chunks):
+        """Replace the chunks stored for a record"""
+        with self._lock:
+            self.remove(chunk_record_key)
+            keys = []
+            for chunk in chunks:
+                terms = tokenize(chunk.text)
+                for term, tf in Counter(terms).items():
+                    self._postings.setdefault(term, {})[chunk.key] = tf
+                self._chunks[chunk.key] = (chunk, len(terms))
+                self._total_length += len(terms)
+                keys.append(chunk.key)
+            self._by_record[chunk_record_key] = keys
+
+    def remove(self, chunk_record_key):
+        """Drop every chunk stored for a record"""
+        with self._lock:
+            for key in self._by_record.pop(chunk_record_key, []):
+                chunk, length = self._chunks.pop(key)
+                self._total_length -= length
+                for term in set(tokenize(chunk.text)):
+                    posting = self._postings.get(term)
+                    if posting is not None:
+                        posting.pop(key, None)
+                        if not posting:
+                            del self._postings[term]
+
+    def search(self, query, k=5):
+        """Return up to k (score, Chunk) pairs ranked by BM25 score"""
+        with self._lock:
+            total = len(self._chunks)
+            if not total:
+                return []
+            avg_length = self._total_length / total or 1.0
+            scores = {}
+            for term in set(tokenize(query)):
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+                for key, tf in posting.items():
+                    length = self._chunks[key][1]
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / norm
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [(score, self._chunks[key][0]) for key, score in best]
+
+
+search_index = BM25Index()
+# Collection versions reflected by this worker's search index
+_index_versions = {}
+_build_lock = threading.Lock()
+
+
+def _db_chunks():
+    for model in (Article, PromotionalEvent, Solution):
+        for record in model.query.yield_per(500):
+            yield record, chunks_for_record(record)
+
+
+def build_index():
+    """Rebuild the search index from every article, event and solution"""
+    with _build_lock:
+        _build_index()
+
+
+def _build_index():
+    global search_index, _index_versions
+    # Read versions before scanning so a write during the scan triggers another rebuild
+    current = versions.get_many(RETRIEVAL_SOURCES)
+    index = BM25Index()
+    for record, chunks in _db_chunks():
+        index.add(record_key(record), chunks)
+    # Swap in the finished index so concurrent searches never see a partial build
+    search_index = index
+    _index_versions = current
+
+
+def ensure_fresh():
+    """Rebuild the local index if another worker has written to a retrieval source"""
+    if versions.get_many(RETRIEVAL_SOURCES) == _index_versions:
+        return
+    # Only one thread rebuilds; the others keep serving the current index meanwhile
+    if _build_lock.acquire(blocking=False):
+        try:
+            _build_index()
+        finally:
+            _build_lock.release()
+
+
+def _source_changed(kind):
+    # The write already bumped the version when it was flushed; if that was the only
+    # change since the last build, this worker's index is current again
+    version = versions.get_many([kind])[kind]
+    if _index_versions.get(kind) == version - 1:
+        _index_versions[kind] = version
+
+
+def rebuild_vector_store(company_context):
+    """Re-embed every article, event, solution and company_context chunk"""
+    chunks = chunks_for_company_context(company_context)
+    for _, record_chunks in _db_chunks():
+        chunks.extend(record_chunks)
+    vector_store.rebuild(chunks)
+
+
+def sync_vector_store(company_context):
+    """Build the vector store if needed, otherwise refresh the company_context chunks"""
+    if not vector_store.is_current():
+        rebuild_vector_store(company_context)
+        return
+    sections = {}
+    for chunk in chunks_for_company_context(company_context):
+        sections.setdefault(f"{chunk.kind}:{chunk.record_id}", []).append(chunk)
+    for section, chunks in sections.items():
+        vector_store.upsert(section, chunks)
+    # Sections taken out of company_context.json must not keep answering questions
+    for section in vector_store.records("company_context"):
+        if section not in sections:
+            vector_store.delete(section)
+
+
+def record_changed(record):
+    """Re-index a record after it has been created or updated"""
+    chunks = chunks_for_record(record)
+    search_index.add(record_key(record), chunks)
+    _source_changed(record.__tablename__)
+    try:
+        vector_store.upsert("%s:%s" % record_key(record), chunks)
+    except Exception as e:
+        print(f"Error updating vector store: {str(e)}")
+
+
+def record_deleted(record):
+    """Remove a deleted record from the search indexes"""
+    search_index.remove(record_key(record))
+    _source_changed(record.__tablename__)
+    try:
+        vector_store.delete("%s:%s" % record_key(record))
+    except Exception as e:
+        print(f"Error updating vector store: {str(e)}")
+
+
+def _drop_past_events(chunks):
+    """Remove chunks of events that are no longer upcoming.
+
+    Events stay indexed after they start, since upcoming depends on the clock, so the
+    check happens here: one query on the ids of the event chunks among the candidates.
+    """
+    event_ids = {chunk.record_id for chunk in chunks if chunk.kind == 'promotional_event'}
+    if not event_ids:
+        return chunks
+    upcoming = {
+        event_id for event_id, in PromotionalEvent.query.with_entities(PromotionalEvent.id)
+        .filter(PromotionalEvent.id.in_(event_ids), PromotionalEvent.upcoming)
+    }
+    return [chunk for chunk in chunks if chunk.kind != 'promotional_event' or chunk.record_id in upcoming]
+
+
+def search(query, k=5):
+    """Return the top-k chunks matching the query"""
+    # Over-fetch so dropping past events still leaves k results
+    return _drop_past_events([chunk for _, chunk in search_index.search(query, k * 2)])[:k]
+
+
+def hybrid_search(query, k=5):
+    """Fuse keyword (BM25) and dense-vector rankings with reciprocal rank fusion"""
+    fused = {}
+    chunks = {}
+    for results in (search_index.search(query, k * 2), vector_store.search(query, k * 2)):
+        for rank, (_, chunk) in enumerate(results):
+            fused[chunk.key] = fused.get(chunk.key, 0.0) + 1.0 / (RRF_K + rank + 1)
+            chunks[chunk.key] = chunk
+    ranked = [chunks[key] for key, _ in sorted(fused.items(), key=lambda item: item[1], reverse=True)]
+    return _drop_past_events(ranked)[:k]
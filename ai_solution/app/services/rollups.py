@@ -0,0 +1,206 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, event, func, inspect, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.models import db, ContactInquiry, CustomerFeedback, CustomerRatingSummary, InquiryDailyCount
+
+GRANULARITIES = ('day', 'week', 'month')
+
+UPSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def _key(submission_date, status):
+    return submission_date.date(), status or ''
+
+
+def _old_values(obj, names):
+    """Values of `names` as last loaded from the database, or None if any is unknown"""
+    state = inspect(obj)
+    old = []
+    for name in names:
+        history = state.attrs[name].history
+        if history.deleted:
+            old.append(history.deleted[0])
+        elif history.unchanged:
+            old.append(history.unchanged[0])
+        else:
+            return None
+    return old
+
+
+def _old_key(obj):
+    """(day, status) the inquiry was counted under before this flush, if known"""
+    old = _old_values(obj, ('submission_date', 'status'))
+    return _key(*old) if old is not None else None
+
+
+def _count_feedback(summaries, customer_id, rating, step):
+    totals = summaries[customer_id]
+    totals['feedback_count'] += step
+    if rating is not None and 1 <= int(rating) <= 5:
+        totals['rating_count'] += step
+        totals['rating_total'] += step * int(rating)
+        totals[f'rating_{int(rating)}'] += step
+
+
+def _collect_changes(session, flush_context, instances):
+    """Turn this flush's inquiry and feedback writes into deltas on the rollup tables.
+
+    Runs before the flush so deleted rows can still be read; column defaults are
+    filled in here for the same reason.
+    """
+    _collect_feedback(session)
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, ContactInquiry):
+            if obj.submission_date is None:
+                obj.submission_date = datetime.utcnow()
+            if obj.status is None:
+                obj.status = 'Pending'
+            deltas[_key(obj.submission_date, obj.status)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, ContactInquiry):
+            deltas[_key(obj.submission_date, obj.status)] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, ContactInquiry) and session.is_modified(obj):
+            old, new = _old_key(obj), _key(obj.submission_date, obj.status)
+            if old is not None and old != new:
+                deltas[old] -= 1
+                deltas[new] += 1
+
+    connection = session.connection()
+    for (day, status), delta in deltas.items():
+        if delta:
+            _add(connection, InquiryDailyCount, {'day': day, 'status': status}, {'count': delta})
+
+
+def _collect_feedback(session):
+    """Per-customer rating deltas for feedback added, re-rated, moved or deleted"""
+    summaries = defaultdict(Counter)
+    for obj in session.new:
+        if isinstance(obj, CustomerFeedback):
+            _count_feedback(summaries, obj.customer_id, obj.rating, 1)
+    for obj in session.deleted:
+        if isinstance(obj, CustomerFeedback):
+            _count_feedback(summaries, obj.customer_id, obj.rating, -1)
+    for obj in session.dirty:
+        if isinstance(obj, CustomerFeedback) and session.is_modified(obj):
+            old = _old_values(obj, ('customer_id', 'rating'))
+            if old is not None and old != [obj.customer_id, obj.rating]:
+                _count_feedback(summaries, *old, -1)
+                _count_feedback(summaries, obj.customer_id, obj.rating, 1)
+
+    connection = session.connection()
+    for customer_id, totals in summaries.items():
+        deltas = {name: delta for name, delta in totals.items() if delta}
+        if deltas:
+            _add(connection, CustomerRatingSummary, {'customer_id': customer_id}, deltas)
+
+
+def _add(connection, model, keys, deltas):
+    """Add `deltas` to the columns of the `model` row identified by `keys`, creating it if missing"""
+    insert = UPSERTS.get(connection.dialect.name)
+    if insert is not None:
+        statement = insert(model).values(**keys, **deltas)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: getattr(model, name) + getattr(statement.excluded, name) for name in deltas}
+        ))
+        return
+    updated = connection.execute(
+        update(model).filter_by(**keys)
+        .values({name: getattr(model, name) + delta for name, delta in deltas.items()})
+    ).rowcount
+    if not updated:
+        connection.execute(model.__table__.insert().values(**keys, **deltas))
+
+
+def init_rollups():
+    """Keep InquiryDailyCount and CustomerRatingSummary current on every flush of the app's session"""
+    if not event.contains(db.session, 'before_flush', _collect_changes):
+        event.listen(db.session, 'before_flush', _collect_changes)
+
+
+def _bucket(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def timeline(start=None, end=None, granularity='day'):
+    """Inquiry counts per day, ISO week (keyed by its Monday) or month, oldest first.
+
+    `start` and `end` are inclusive dates. Reads one rollup row per day and status
+    in range, however many inquiries there are. Empty buckets are left out.
+    """
+    query = db.session.query(InquiryDailyCount.day, func.sum(InquiryDailyCount.count))
+    if start is not None:
+        query = query.filter(InquiryDailyCount.day >= start)
+    if end is not None:
+        query = query.filter(InquiryDailyCount.day <= end)
+    totals = Counter()
+    for day, count in query.group_by(InquiryDailyCount.day):
+        totals[_bucket(day, granularity)] += int(count or 0)
+    return [(bucket, totals[bucket]) for bucket in sorted(totals) if totals[bucket] > 0]
+
+
+def rebuild():
+    """Recompute the rollup from contact_inquiry, fixing any drift; returns the number of rows.
+
+    On Postgres inquiry writes wait until the rebuild commits, so none are missed.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("LOCK TABLE contact_inquiry IN SHARE MODE"))
+    day = func.date(ContactInquiry.submission_date)
+    status = func.coalesce(ContactInquiry.status, '')
+    rows = (
+        db.session.query(day, status, func.count(ContactInquiry.id))
+        .filter(ContactInquiry.submission_date.isnot(None))
+        .group_by(day, status)
+        .all()
+    )
+    InquiryDailyCount.query.delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(InquiryDailyCount, [
+        {
+            'day': date.fromisoformat(str(day)),
+            'status': status,
+            'count': count,
+        } for day, status, count in rows
+    ])
+    db.session.commit()
+    return len(rows)
+
+
+def rebuild_rating_summaries():
+    """Recompute every customer's rating summary from customer_feedback; returns the number of customers"""
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("LOCK TABLE customer_feedback IN SHARE MODE"))
+    rating = CustomerFeedback.rating
+    rows = (
+        db.session.query(
+            CustomerFeedback.customer_id,
+            func.count(CustomerFeedback.id),
+            func.count(rating),
+            func.coalesce(func.sum(rating), 0),
+            *[func.sum(case((rating == stars, 1), else_=0)) for stars in range(1, 6)]
+        )
+        .group_by(CustomerFeedback.customer_id)
+        .all()
+    )
+    CustomerRatingSummary.query.delete(synchronize_session=False)
+    db.session.bulk_insert_mappings(CustomerRatingSummary, [
+        {
+            'customer_id': customer_id,
+            'feedback_count': feedback_count,
+            'rating_count': rating_count,
+            'rating_total': int(rating_total),
+            **{f'rating_{stars}': int(n or 0) for stars, n in enumerate(histogram, 1)},
+        } for customer_id, feedback_count, rating_count, rating_total, *histogram in rows
+    ])
+    db.session.commit()
+    return len(rows)
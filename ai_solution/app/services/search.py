@@ -0,0 +1,146 @@
+import re
+import uuid
+from markupsafe import escape
+from sqlalchemy import and_, inspect, or_, text
+from app.models.models import db, Article, Solution
+
+SNIPPET_WORDS = 30
+# ts_headline returns the stored text unescaped, so matches are delimited with tokens
+# that survive HTML escaping and are only turned into <mark> afterwards
+_START_SEL = f"hlstart{uuid.uuid4().hex}"
+_STOP_SEL = f"hlstop{uuid.uuid4().hex}"
+HEADLINE_OPTIONS = f"MaxFragments=2, MaxWords=20, MinWords=8, StartSel={_START_SEL}, StopSel={_STOP_SEL}"
+# The fallback ranks in Python, so it only looks at this many matching rows per type
+FALLBACK_CANDIDATES = 1000
+
+# Rows live in the tsvector columns added by migration c4d81f27e9a3
+POSTGRES_SEARCH = """
+WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query),
+hits AS (
+    SELECT 'article' AS type, a.id, ts_rank_cd(a.search_vector, q.query) AS score
+    FROM article a, q
+    WHERE :include_articles AND a.search_vector @@ q.query
+    UNION ALL
+    SELECT 'solution' AS type, s.id, ts_rank_cd(s.search_vector, q.query) AS score
+    FROM solution s, q
+    WHERE :include_solutions AND s.search_vector @@ q.query
+),
+page AS (
+    SELECT * FROM hits ORDER BY score DESC, type, id DESC LIMIT :limit OFFSET :offset
+)
+SELECT page.type, page.id, page.score, COALESCE(a.title, s.title) AS title,
+       ts_headline('english',
+                   COALESCE(a.content, CONCAT_WS(' ', s.description, s.key_features), ''),
+                   q.query, :options) AS snippet
+FROM page CROSS JOIN q
+LEFT JOIN article a ON page.type = 'article' AND a.id = page.id
+LEFT JOIN solution s ON page.type = 'solution' AND s.id = page.id
+ORDER BY page.score DESC, page.type, page.id DESC
+"""
+
+# type -> (model, title column, weighted text columns, snippet columns)
+FALLBACK_SOURCES = {
+    'article': (Article, 'title', {'title': 3, 'category': 2, 'content': 1}, ('content',)),
+    'solution': (Solution, 'title', {'title': 3, 'key_features': 2, 'description': 1}, ('description', 'key_features')),
+}
+
+_has_search_vectors = None
+
+
+def uses_full_text():
+    """True on Postgres once the search_vector columns exist"""
+    global _has_search_vectors
+    if _has_search_vectors is None:
+        _has_search_vectors = db.engine.dialect.name == 'postgresql' and all(
+            any(column['name'] == 'search_vector' for column in inspect(db.engine).get_columns(table))
+            for table in ('article', 'solution')
+        )
+    return _has_search_vectors
+
+
+def search(q, types=('article', 'solution'), limit=20, offset=0):
+    """Rank articles and solutions against `q`; returns (results, has_more).
+
+    Each result is {type, id, title, snippet, score}. Snippets are HTML with matches
+    wrapped in <mark>.
+    """
+    if uses_full_text():
+        return _search_postgres(q, types, limit, offset)
+    return _search_fallback(q, types, limit, offset)
+
+
+def _search_postgres(q, types, limit, offset):
+    rows = db.session.execute(text(POSTGRES_SEARCH), {
+        'q': q,
+        'include_articles': 'article' in types,
+        'include_solutions': 'solution' in types,
+        'limit': limit + 1,
+        'offset': offset,
+        'options': HEADLINE_OPTIONS,
+    }).all()
+    results = [
+        {'type': row.type, 'id': row.id, 'title': row.title, 'snippet': _marked(row.snippet), 'score': float(row.score)}
+        for row in rows[:limit]
+    ]
+    return results, len(rows) > limit
+
+
+def _marked(headline):
+    """Escape a ts_headline fragment and turn its match delimiters into <mark> tags"""
+    return str(escape(headline or "")).replace(_START_SEL, "<mark>").replace(_STOP_SEL, "</mark>")
+
+
+def _terms(q):
+    return [term for term in re.findall(r"\w+", q.lower()) if len(term) > 1][:8]
+
+
+def _like_pattern(term):
+    """Substring LIKE pattern matching `term` literally; \\w lets '_' through, which LIKE treats as a wildcard"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _snippet(body, terms):
+    """Window of text around the first matching term, escaped, with matches marked"""
+    words = body.split()
+    lowered = [word.lower() for word in words]
+    first = next((i for i, word in enumerate(lowered) if any(term in word for term in terms)), 0)
+    start = max(0, first - SNIPPET_WORDS // 3)
+    window = " ".join(words[start:start + SNIPPET_WORDS])
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    marked = "".join(
+        f"<mark>{escape(part)}</mark>" if pattern.fullmatch(part) else str(escape(part))
+        for part in re.split(f"({pattern.pattern})", window, flags=re.IGNORECASE) if part
+    )
+    prefix = "... " if start else ""
+    suffix = " ..." if start + SNIPPET_WORDS < len(words) else ""
+    return prefix + marked + suffix
+
+
+def _search_fallback(q, types, limit, offset):
+    """Portable LIKE-based search for SQLite and other databases without tsvector"""
+    terms = _terms(q)
+    if not terms:
+        return [], False
+    scored = []
+    for type_name in types:
+        model, title_column, weights, snippet_columns = FALLBACK_SOURCES[type_name]
+        columns = [getattr(model, name) for name in weights]
+        # Every term has to appear in at least one of the columns
+        condition = and_(*[or_(*[column.ilike(_like_pattern(term), escape="\\") for column in columns]) for term in terms])
+        for row in model.query.filter(condition).order_by(model.id.desc()).limit(FALLBACK_CANDIDATES):
+            score = sum(
+                weight * (getattr(row, name) or "").lower().count(term)
+                for name, weight in weights.items()
+                for term in terms
+            )
+            body = " ".join(filter(None, (getattr(row, name) for name in snippet_columns)))
+            scored.append({
+                'type': type_name,
+                'id': row.id,
+                'title': getattr(row, title_column),
+                'snippet': _snippet(body, terms),
+                'score': float(score),
+            })
+    scored.sort(key=lambda result: (-result['score'], result['type'], -result['id']))
+    return scored[offset:offset + limit], len(scored) > offset + limit
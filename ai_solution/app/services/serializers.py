@@ -0,0 +1,54 @@
+from sqlalchemy.orm import joinedload
+from app.models.models import Article, CustomerFeedback, Solution, User
+
+
+# List queries join in the related user's username, so serializing a page costs one
+# query instead of one more per row
+def article_query():
+    return Article.query.options(joinedload(Article.author).load_only(User.username))
+
+
+def solution_query():
+    return Solution.query.options(joinedload(Solution.customer).load_only(User.username))
+
+
+def feedback_query():
+    return CustomerFeedback.query.options(joinedload(CustomerFeedback.customer).load_only(User.username))
+
+
+def serialize_article(article):
+    return {
+        'id': article.id,
+        'title': article.title,
+        'content': article.content,
+        'author_id': article.author_id,
+        'author_name': article.author.username,
+        'category': article.category,
+        'published_date': article.published_date,
+        'image_url': article.image_url
+    }
+
+
+def serialize_solution(solution):
+    return {
+        'id': solution.id,
+        'customer_id': solution.customer_id,
+        'customer_name': solution.customer.username,  # Get customer name
+        'title': solution.title,
+        'description': solution.description,
+        'industry': solution.industry,
+        'key_features': solution.key_features,
+        'image_url': solution.image_url,
+        'created_at': solution.created_at
+    }
+
+
+def serialize_feedback(feedback):
+    return {
+        'id': feedback.id,
+        'customer_id': feedback.customer_id,
+        'customer_name': feedback.customer.username,  # Get customer name
+        'feedback_text': feedback.feedback_text,
+        'rating': feedback.rating,
+        'feedback_date': feedback.feedback_date
+    }
@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key onto one upstream call.
+
+    The first caller for a key (the leader) starts the work; callers arriving
+    while it is still running get the leader's future and share its outcome,
+    including any exception.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.collapsed = 0
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, start):
+        """Return a Future for key, calling start() (which returns a Future) only if none is in flight"""
+        with self._lock:
+            shared = self._calls.get(key)
+            if shared is not None:
+                self.collapsed += 1
+                return shared
+            shared = self._calls[key] = Future()
+            self.leaders += 1
+
+        try:
+            upstream = start()
+        except BaseException as e:
+            self._finish(key, shared, exception=e)
+            return shared
+        upstream.add_done_callback(lambda f: self._finish_from(key, shared, f))
+        return shared
+
+    def _finish_from(self, key, shared, upstream):
+        exception = upstream.exception()
+        if exception is not None:
+            self._finish(key, shared, exception=exception)
+        else:
+            self._finish(key, shared, result=upstream.result())
+
+    def _finish(self, key, shared, result=None, exception=None):
+        # Forget the key first so callers arriving after completion start a fresh call
+        with self._lock:
+            self._calls.pop(key, None)
+        if exception is not None:
+            shared.set_exception(exception)
+        else:
+            shared.set_result(result)
+
+    def stats(self):
+        return {
+            'upstream_calls': self.leaders,
+            'collapsed': self.collapsed,
+            'in_flight': len(self._calls),
+        }
@@ -0,0 +1,213 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+from numpy.lib.format import open_memmap
+from app.config import Config
+from app.services.chunking import Chunk
+from app.services.embeddings import get_embedder
+
+MIN_CAPACITY = 64
+MIN_ROWS_TO_COMPACT = 256
+
+
+class VectorStore:
+    """Dense-vector store backed by a memory-mapped float32 matrix.
+
+    The matrix lives in a .npy file that every worker maps read-only, so the OS
+    page cache holds one shared copy. Row metadata (chunk key and text) and the
+    list of tombstoned rows live next to it in meta.json. Writers serialise on a
+    file lock; readers notice a new meta.json and remap.
+    """
+
+    def __init__(self, path, embedder, compact_ratio=0.25):
+        self.path = Path(path)
+        self.embedder = embedder
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self._meta_stat = None
+        self._meta = None
+        self._matrix = None
+        self._deleted = None
+        self._rows_by_record = {}
+
+    @property
+    def meta_path(self):
+        return self.path / "meta.json"
+
+    @contextmanager
+    def _write_lock(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path / "write.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Reload metadata and remap the matrix if another process rewrote the store"""
+        try:
+            stat = os.stat(self.meta_path)
+        except FileNotFoundError:
+            self._meta_stat, self._meta, self._matrix = None, None, None
+            self._rows_by_record = {}
+            return
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature == self._meta_stat:
+            return
+
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        count = len(meta['rows'])
+        matrix = open_memmap(self.path / meta['file'], mode='r') if count else None
+        deleted = np.zeros(count, dtype=bool)
+        deleted[meta['deleted']] = True
+
+        rows_by_record = {}
+        for row, (key, kind, record_id, _, _) in enumerate(meta['rows']):
+            if not deleted[row]:
+                rows_by_record.setdefault(f"{kind}:{record_id}", []).append(row)
+
+        self._meta_stat = signature
+        self._meta, self._matrix, self._deleted = meta, matrix, deleted
+        self._rows_by_record = rows_by_record
+
+    def _save_meta(self, meta):
+        tmp_path = self.meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+        self._refresh()
+
+    def _write_matrix(self, meta, vectors, capacity):
+        """Write vectors into a fresh file of the given capacity and point meta at it"""
+        old_file = meta.get('file')
+        meta['generation'] = meta.get('generation', 0) + 1
+        meta['file'] = f"vectors-{meta['generation']}.npy"
+        matrix = open_memmap(self.path / meta['file'], mode='w+', dtype=np.float32,
+                             shape=(capacity, self.embedder.dim))
+        matrix[:len(vectors)] = vectors
+        matrix.flush()
+        meta['capacity'] = capacity
+        return old_file
+
+    def _remove_file(self, name):
+        # Readers that still map the old file keep their pages until they remap
+        if name:
+            try:
+                os.remove(self.path / name)
+            except OSError:
+                pass
+
+    def _matches_embedder(self):
+        return (self._meta is not None
+                and self._meta['embedder'] == self.embedder.name
+                and self._meta['dim'] == self.embedder.dim)
+
+    def is_current(self):
+        """True if the store exists and was built with the configured embedder"""
+        with self._lock:
+            self._refresh()
+            return self._matches_embedder()
+
+    def records(self, kind):
+        """Names ("kind:id") of the records of one kind that have live rows"""
+        with self._lock:
+            self._refresh()
+            return [record for record in self._rows_by_record if record.startswith(f"{kind}:")]
+
+    def rebuild(self, chunks):
+        """Replace the whole store with embeddings for the given chunks"""
+        chunks = list(chunks)
+        vectors = self.embedder.embed_many([chunk.text for chunk in chunks])
+        with self._write_lock():
+            meta = dict(self._meta or {})
+            meta.update(embedder=self.embedder.name, dim=self.embedder.dim, deleted=[],
+                        rows=[list(chunk) for chunk in chunks])
+            old_file = self._write_matrix(meta, vectors, max(MIN_CAPACITY, len(chunks)))
+            self._save_meta(meta)
+            self._remove_file(old_file)
+
+    def upsert(self, record, chunks):
+        """Tombstone the rows stored for a record ("kind:id") and append its new chunks"""
+        chunks = list(chunks)
+        with self._write_lock():
+            if self._meta is None:
+                raise RuntimeError("Vector store has not been built; run 'flask rebuild-vector-store'")
+            meta = dict(self._meta)
+            old_rows = self._rows_by_record.get(record, [])
+            if [meta['rows'][row] for row in old_rows] == [list(chunk) for chunk in chunks]:
+                return
+
+            meta['deleted'] = meta['deleted'] + old_rows
+            vectors = self.embedder.embed_many([chunk.text for chunk in chunks])
+            count = len(meta['rows'])
+            meta['rows'] = meta['rows'] + [list(chunk) for chunk in chunks]
+
+            old_files = []
+            if count + len(chunks) > meta['capacity']:
+                existing = self._matrix[:count] if count else np.zeros((0, self.embedder.dim), np.float32)
+                capacity = max(2 * meta['capacity'], count + len(chunks))
+                old_files.append(self._write_matrix(meta, np.vstack([existing, vectors]), capacity))
+            elif chunks:
+                matrix = open_memmap(self.path / meta['file'], mode='r+')
+                matrix[count:count + len(chunks)] = vectors
+                matrix.flush()
+                del matrix
+
+            if self._should_compact(meta):
+                old_files.append(self._compact(meta))
+            # Old files go only once meta.json names the new one, so a crash or another
+            # worker's refresh never finds meta pointing at a missing file
+            self._save_meta(meta)
+            for old_file in old_files:
+                self._remove_file(old_file)
+
+    def delete(self, record):
+        """Tombstone every row stored for a record ("kind:id")"""
+        self.upsert(record, [])
+
+    def _should_compact(self, meta):
+        rows = len(meta['rows'])
+        return rows >= MIN_ROWS_TO_COMPACT and len(meta['deleted']) > self.compact_ratio * rows
+
+    def _compact(self, meta):
+        """Rewrite the matrix with only live rows, returning the file it replaced"""
+        matrix = open_memmap(self.path / meta['file'], mode='r')
+        deleted = set(meta['deleted'])
+        live = [row for row in range(len(meta['rows'])) if row not in deleted]
+        vectors = np.asarray(matrix[live])
+        del matrix
+        meta['rows'] = [meta['rows'][row] for row in live]
+        meta['deleted'] = []
+        return self._write_matrix(meta, vectors, max(MIN_CAPACITY, 2 * len(live)))
+
+    def search(self, query, k=5):
+        """Return up to k (score, Chunk) pairs ranked by cosine similarity"""
+        with self._lock:
+            self._refresh()
+            if self._matrix is None or not self._matches_embedder():
+                return []
+            meta, matrix, deleted = self._meta, self._matrix, self._deleted
+
+        count = len(meta['rows'])
+        scores = matrix[:count] @ self.embedder.embed(query)
+        scores[deleted] = -np.inf
+        k = min(k, count - int(deleted.sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(float(scores[row]), Chunk(*meta['rows'][row])) for row in top if scores[row] > 0]
+
+
+vector_store = VectorStore(
+    Config.VECTOR_STORE_PATH,
+    get_embedder(Config.EMBEDDER, Config.EMBEDDING_DIM),
+    compact_ratio=Config.VECTOR_STORE_COMPACT_RATIO,
+)
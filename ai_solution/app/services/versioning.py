@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from sqlalchemy import update
+from app.models.models import db, CollectionVersion
+
+# Collections whose content feeds the chatbot's retrieval step
+RETRIEVAL_SOURCES = ('article', 'promotional_event', 'solution')
+
+# Tables whose writes bump their collection version; users appear in the catalog listings
+VERSIONED_COLLECTIONS = RETRIEVAL_SOURCES + ('user',)
+
+
+class CollectionVersions:
+    """Monotonic per-collection version counters kept in the database.
+
+    Flushes that write a versioned table bump its counter in the same transaction
+    (see app.services.counters), so every worker sees a write as soon as it commits
+    and a rolled-back write never moves a version.
+    """
+
+    def _rows(self, collections):
+        rows = db.session.query(CollectionVersion).filter(CollectionVersion.collection.in_(collections))
+        return {row.collection: row for row in rows}
+
+    def bump(self, collection):
+        """Bump a collection for writes that bypass the ORM, such as bulk updates; the caller commits"""
+        self.bump_in(db.session.connection(), [collection])
+
+    def bump_in(self, connection, collections):
+        # Imported here: rollups pulls in the models that import this module indirectly
+        from app.services.rollups import UPSERTS
+
+        now = datetime.utcnow()
+        insert = UPSERTS.get(connection.dialect.name)
+        for collection in sorted(collections):
+            if insert is not None:
+                statement = insert(CollectionVersion).values(collection=collection, version=1, modified_at=now)
+                connection.execute(statement.on_conflict_do_update(
+                    index_elements=['collection'],
+                    set_={'version': CollectionVersion.version + 1, 'modified_at': now}
+                ))
+                continue
+            updated = connection.execute(
+                update(CollectionVersion).where(CollectionVersion.collection == collection)
+                .values(version=CollectionVersion.version + 1, modified_at=now)
+            ).rowcount
+            if not updated:
+                connection.execute(CollectionVersion.__table__.insert().values(
+                    collection=collection, version=1, modified_at=now
+                ))
+
+    def get_many(self, collections):
+        rows = self._rows(collections)
+        return {c: rows[c].version if c in rows else 0 for c in collections}
+
+    def stamp(self, collections):
+        """Return a string that changes whenever any of the collections changes"""
+        versions = self.get_many(collections)
+        return ".".join(str(versions[c]) for c in collections)
+
+    def state(self, collections):
+        """(stamp, last modified) from one query.
+
+        A collection with no row yet has never been written through the ORM, so its
+        last-modified time is taken as now, which never satisfies If-Modified-Since.
+        """
+        rows = self._rows(collections)
+        stamp = ".".join(str(rows[c].version) if c in rows else "0" for c in collections)
+        times = [rows[c].modified_at if c in rows else datetime.utcnow() for c in collections]
+        return stamp, max(times).replace(tzinfo=timezone.utc)
+
+
+versions = CollectionVersions()
@@ -0,0 +1,26 @@
+"""Add chat message history index
+
+Revision ID: 5c0e92d7a4b1
+Revises: 8d21c4e7b5f3
+Create Date: 2026-10-18 11:42:37.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e92d7a4b1'
+down_revision = '8d21c4e7b5f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_message', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_message_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chat_message', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_message_user_id_created_at_id')
@@ -0,0 +1,31 @@
+"""Add chat message status
+
+Revision ID: 8d21c4e7b5f3
+Revises: 3b8e1f0c9a27
+Create Date: 2026-10-18 10:04:11.562930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d21c4e7b5f3'
+down_revision = '3b8e1f0c9a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_message', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), nullable=True))
+
+    # Messages stored before this revision were answered or lost in a rollback
+    op.execute(
+        "UPDATE chat_message SET status = CASE WHEN response IS NULL THEN 'failed' ELSE 'answered' END"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('chat_message', schema=None) as batch_op:
+        batch_op.drop_column('status')
@@ -0,0 +1,52 @@
+"""Add full text search vectors
+
+Revision ID: c4d81f27e9a3
+Revises: a7f3d25e8c60
+Create Date: 2026-10-18 13:26:54.381207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d81f27e9a3'
+down_revision = 'a7f3d25e8c60'
+branch_labels = None
+depends_on = None
+
+# Titles weigh most, then category / key features, then the body text
+ARTICLE_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+SOLUTION_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(key_features, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade():
+    # Only Postgres has tsvector; other databases use the LIKE fallback in app/services/search.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.add_column('article', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                       sa.Computed(ARTICLE_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_article_search_vector', 'article', ['search_vector'], unique=False, postgresql_using='gin')
+    op.add_column('solution', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                        sa.Computed(SOLUTION_VECTOR, persisted=True), nullable=True))
+    op.create_index('ix_solution_search_vector', 'solution', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_solution_search_vector', table_name='solution', postgresql_using='gin')
+    op.drop_column('solution', 'search_vector')
+    op.drop_index('ix_article_search_vector', table_name='article', postgresql_using='gin')
+    op.drop_column('article', 'search_vector')
@@ -1,5 +1,6 @@
+import click
 from app import create_app, db
-from app.models.models import User
+from app.models.models import User, PromotionalEvent
 
 app = create_app()
 
@@ -21,5 +22,116 @@ def create_admin():
     db.session.commit()
     print("Admin user created successfully!")
 
+@app.cli.command("rebuild-vector-store")
+def rebuild_vector_store():
+    """Re-embed all retrieval sources and compact the vector store"""
+    from app.services import retrieval
+    from app.services.chunking import load_company_context
+
+    retrieval.rebuild_vector_store(load_company_context())
+    print("Vector store rebuilt successfully!")
+
+@app.cli.command("load-test")
+@click.option("--url", default="http://localhost:5000/api/chat", help="Chat endpoint to drive")
+@click.option("--rps", default=10.0, help="Target requests per second")
+@click.option("--duration", default=30.0, help="Test length in seconds")
+@click.option("--concurrency", default=64, help="Maximum concurrent client connections")
+@click.option("--messages-file", type=click.File(), help="Questions to send, one per line")
+def load_test(url, rps, duration, concurrency, messages_file):
+    """Drive the chat endpoint at a fixed request rate and report latency percentiles.
+
+    Run the server with LLM_BACKEND=fake to size workers without calling Gemini.
+    """
+    from app.services.load_test import run_load_test, format_report
+
+    messages = [line.strip() for line in messages_file if line.strip()] if messages_file else None
+    report = run_load_test(url, rps, duration, concurrency=concurrency, messages=messages)
+    print(format_report(report))
+
+@app.cli.command("batch-answer")
+@click.argument("input_file", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_file", type=click.Path(dir_okay=False))
+@click.option("--concurrency", default=4, help="Questions answered in parallel")
+@click.option("--retry-failed", is_flag=True, help="Re-run questions that failed in a previous run")
+def batch_answer(input_file, output_file, concurrency, retry_failed):
+    """Answer a JSONL file of questions through the chatbot, appending JSONL results.
+
+    Rerunning with the same OUTPUT_FILE skips questions it already answered, so an
+    interrupted run picks up where it stopped.
+    """
+    from app.services.ai_service import ChatbotService
+    from app.services.batch_answer import run_batch
+
+    summary = run_batch(app, ChatbotService(), input_file, output_file,
+                        concurrency=concurrency, retry_failed=retry_failed)
+    print(f"Answered {summary['answered']}, failed {summary['failed']}, "
+          f"skipped {summary['skipped']} already done in {summary['elapsed_seconds']:.1f}s "
+          f"(p50={summary['p50_ms']:.0f}ms p95={summary['p95_ms']:.0f}ms)")
+
+@app.cli.command("export")
+@click.argument("name", type=click.Choice(["contacts", "feedback", "chat"]))
+@click.option("--format", "fmt", type=click.Choice(["csv", "ndjson"]), default="csv")
+@click.option("--from", "start", help="First day to include (ISO date)")
+@click.option("--to", "end", help="Last day to include (ISO date)")
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output")
+@click.option("--output", "-o", type=click.File("wb"), default="-", help="File to write, stdout by default")
+def export(name, fmt, start, end, compress, output):
+    """Stream contacts, feedback or chat logs to CSV or NDJSON"""
+    from app.services.export import parse_date, stream_export
+
+    for chunk in stream_export(name, fmt, parse_date(start), parse_date(end, end=True), compress):
+        output.write(chunk)
+
+@app.cli.command("benchmark-json")
+@click.option("--rows", default=1000, help="Rows in the sample payload")
+@click.option("--repeat", default=20, help="Encodes timed per provider")
+def benchmark_json(rows, repeat):
+    """Compare JSON encode time and response size for each provider and encoding"""
+    from app.services.json_provider import benchmark, sample_payload
+
+    for result in benchmark(app, sample_payload(rows), repeat=repeat):
+        br = f"{result['br_bytes']} B" if result['br_bytes'] is not None else "n/a (brotli not installed)"
+        print(f"{result['provider']:<20} encode {result['encode_ms']:7.2f} ms   "
+              f"identity {result['bytes']} B   gzip {result['gzip_bytes']} B   br {br}")
+
+@app.cli.command("sweep-events")
+def sweep_events():
+    """Clear the stored is_upcoming flag on events that have started; safe to run from cron"""
+    from app.services.versioning import versions
+
+    from app.services import counters
+
+    updated = PromotionalEvent.update_is_upcoming()
+    if updated:
+        # The bulk UPDATE bypasses the flush hook that normally bumps the version
+        versions.bump('promotional_event')
+        db.session.commit()
+    counters.refresh_upcoming()
+    print(f"Marked {updated} started event(s) as past")
+
+@app.cli.command("reconcile-counters")
+def reconcile_counters():
+    """Recount the dashboard summary counters from their tables and fix any drift"""
+    from app.services.counters import reconcile
+
+    drift = reconcile()
+    for counter, (stored, actual) in drift.items():
+        print(f"{counter}: {stored} -> {actual}")
+    print("Counters reconciled" + ("" if drift else ", no drift found"))
+
+@app.cli.command("rebuild-inquiry-rollup")
+def rebuild_inquiry_rollup():
+    """Recompute the daily inquiry rollup behind the dashboard timeline"""
+    from app.services.rollups import rebuild
+
+    print(f"Rebuilt inquiry rollup: {rebuild()} day/status rows")
+
+@app.cli.command("rebuild-rating-summaries")
+def rebuild_rating_summaries():
+    """Recompute the per-customer rating summaries from customer feedback"""
+    from app.services.rollups import rebuild_rating_summaries
+
+    print(f"Rebuilt rating summaries for {rebuild_rating_summaries()} customer(s)")
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+# Config is read when app.config is imported, so point it at a throwaway database first
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['LLM_BACKEND'] = 'fake'
+os.environ['GEMINI_API_KEY'] = 'test'
+os.environ['VECTOR_STORE_PATH'] = os.path.join(tempfile.mkdtemp(), 'vector_store')
+
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.models.models import db
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class QueryCounter:
+    """Counts the SQL statements sent to the database while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_queries(app):
+    return lambda: QueryCounter(db.engine)
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from app import create_app
+from app.config import Config
+from app.models.models import db, ChatMessage, User
+from app.services.ai_service import ChatbotService
+from app.services.llm_backends import LLMBackend
+
+
+class RecordingBackend(LLMBackend):
+    """Answers every prompt and notes how many pooled connections were checked out while it ran"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.held = []
+
+    def generate(self, prompt, timeout=None):
+        self.held.append(self.pool.checkedout())
+        return "answer"
+
+    def stream(self, prompt):
+        self.held.append(self.pool.checkedout())
+        yield "answer"
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    # The in-memory test database shares one connection through a StaticPool, which
+    # cannot report checkouts; a file database gets a real QueuePool
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'chat.db'}")
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user_with_history(file_app):
+    user = User(username="history", email="history@example.com")
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(ChatMessage(user_id=user.id, content="hi", response="hello", status='answered'))
+    db.session.commit()
+    return user.id
+
+
+@pytest.fixture
+def service(file_app, user_with_history):
+    service = ChatbotService()
+    service.backend = RecordingBackend(db.engine.pool)
+    db.session.close()
+    return service
+
+
+@pytest.mark.parametrize('with_history', [False, True])
+def test_no_connection_is_held_during_generation(service, user_with_history, with_history):
+    user_id = user_with_history if with_history else None
+    assert asyncio.run(service.generate_response("What do you sell?", user_id)) == "answer"
+    assert service.backend.held == [0]
+
+
+@pytest.mark.parametrize('with_history', [False, True])
+def test_no_connection_is_held_while_streaming(service, user_with_history, with_history):
+    user_id = user_with_history if with_history else None
+    assert "".join(service.stream_ai_response("What do you sell?", user_id)) == "answer"
+    assert service.backend.held == [0]
@@ -0,0 +1,65 @@
+from app.models.models import db, ChatMessage, ConversationSummary, User
+from app.services.conversation_memory import ConversationMemory
+
+
+class InlineExecutor:
+    """Runs compactions on the calling thread; the in-memory test database has a single connection"""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def _memory(summarize, window_turns):
+    memory = ConversationMemory(summarize, window_turns=window_turns)
+    memory._compactor = InlineExecutor()
+    return memory
+
+
+def _user():
+    user = User(username="memory", email="memory@example.com")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _answered(user, n):
+    message = ChatMessage(user_id=user.id, content=f"question {n}", response=f"answer {n}", status='answered')
+    db.session.add(message)
+    db.session.commit()
+    return message
+
+
+def test_recording_turns_does_not_reload_the_conversation(app, monkeypatch):
+    user = _user()
+    memory = _memory(lambda prompt: "summary", window_turns=3)
+    loads = []
+    load = memory._load
+    monkeypatch.setattr(memory, '_load', lambda user_id: loads.append(user_id) or load(user_id))
+
+    for n in range(6):
+        memory.context_for(user.id)
+        message = _answered(user, n)
+        memory.record_turn(user.id, message.id, message.content, message.response)
+
+    assert loads == [user.id]
+
+
+def test_turns_past_the_window_are_summarized_not_dropped(app):
+    user = _user()
+    for n in range(8):
+        _answered(user, n)
+    prompts = []
+    memory = _memory(lambda prompt: prompts.append(prompt) or "summary", window_turns=2)
+
+    summary, turns = memory.context_for(user.id)
+    assert [t.question for t in turns] == ["question 6", "question 7"]
+
+    message = _answered(user, 8)
+    memory.record_turn(user.id, message.id, message.content, message.response)
+
+    assert len(prompts) == 1
+    assert all(f"question {n}" in prompts[0] for n in range(7))
+    assert db.session.get(ConversationSummary, user.id).summarized_through_id == message.id - 2
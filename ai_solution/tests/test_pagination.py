@@ -0,0 +1,29 @@
+import pytest
+from app.models.models import db
+from test_query_counts import LIST_ENDPOINTS
+
+
+def _rows(response):
+    body = response.get_json()
+    return body['users'] if isinstance(body, dict) else body
+
+
+@pytest.mark.parametrize('url', LIST_ENDPOINTS)
+def test_list_is_bounded_and_cursor_reaches_every_row(client, url):
+    LIST_ENDPOINTS[url](105)
+    db.session.commit()
+
+    response = client.get(url + '?count=true')
+    assert response.status_code == 200
+    assert len(_rows(response)) == 100
+    total = int(response.headers['X-Total-Count'])
+
+    ids = [row['id'] for row in _rows(response)]
+    cursor = response.headers.get('X-Next-Cursor')
+    while cursor:
+        response = client.get(f"{url}?limit=40&cursor={cursor}")
+        ids += [row['id'] for row in _rows(response)]
+        cursor = response.headers.get('X-Next-Cursor')
+
+    assert len(ids) == total
+    assert ids == sorted(set(ids), reverse=True)
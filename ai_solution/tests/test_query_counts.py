@@ -0,0 +1,78 @@
+import itertools
+import pytest
+from app.models.models import db, Article, ContactInquiry, CustomerFeedback, PromotionalEvent, Solution, User
+
+_ids = itertools.count(1)
+
+
+def _user():
+    n = next(_ids)
+    user = User(username=f"user{n}", email=f"user{n}@example.com")
+    db.session.add(user)
+    return user
+
+
+def _seed_articles(n):
+    for _ in range(n):
+        db.session.add(Article(title="Title", content="Content", author=_user(), category="AI"))
+
+
+def _seed_solutions(n):
+    for _ in range(n):
+        db.session.add(Solution(title="Title", customer=_user(), industry="Retail"))
+
+
+def _seed_feedbacks(n):
+    for i in range(n):
+        db.session.add(CustomerFeedback(customer=_user(), feedback_text="Great", rating=i % 5 + 1))
+
+
+def _seed_events(n):
+    for _ in range(n):
+        db.session.add(PromotionalEvent(event_name="Launch"))
+
+
+def _seed_contacts(n):
+    for _ in range(n):
+        db.session.add(ContactInquiry(full_name="Customer", email="customer@example.com"))
+
+
+def _seed_users(n):
+    for _ in range(n):
+        _user()
+
+
+# Each list endpoint with the rows it lists
+LIST_ENDPOINTS = {
+    '/api/articles': _seed_articles,
+    '/api/solutions': _seed_solutions,
+    '/api/feedbacks': _seed_feedbacks,
+    '/api/events': _seed_events,
+    '/api/contacts': _seed_contacts,
+    '/api/users': _seed_users,
+}
+
+
+def _queries_for(client, count_queries, url):
+    with count_queries() as counter:
+        response = client.get(url)
+    assert response.status_code == 200
+    return counter.count
+
+
+@pytest.mark.parametrize('query_string', ['', '?limit=5'])
+@pytest.mark.parametrize('url', LIST_ENDPOINTS)
+def test_list_query_count_does_not_grow_with_rows(client, count_queries, url, query_string):
+    seed = LIST_ENDPOINTS[url]
+    # The first request also warms up app-wide state such as the retrieval index
+    client.get(url + query_string)
+
+    seed(3)
+    db.session.commit()
+    few = _queries_for(client, count_queries, url + query_string)
+
+    seed(30)
+    db.session.commit()
+    many = _queries_for(client, count_queries, url + query_string)
+
+    assert few == many
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import { fetchAllPages } from '@/lib/pagination';
 import { Clock, User } from 'lucide-react';
 import { useRouter } from 'next/navigation';
 
@@ -41,8 +41,8 @@ const ArticlesPage = () => {
   useEffect(() => {
     const fetchArticles = async () => {
       try {
-        const response = await axios.get('http://127.0.0.1:5000/api/articles');
-        setArticles(response.data);
+        const data = await fetchAllPages<Article>('http://127.0.0.1:5000/api/articles', 'Failed to fetch articles');
+        setArticles(data);
         setIsLoading(false);
       } catch (err) {
         setError('Failed to fetch articles');
@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import { fetchAllPages } from '@/lib/pagination';
 import { Calendar, MapPin } from 'lucide-react';
 import { useRouter } from 'next/navigation';
 
@@ -45,11 +45,12 @@ const EventsPage = () => {
     const fetchEvents = async () => {
       try {
         // Fetch events with optional filtering
-        const response = await axios.get(
-          `http://127.0.0.1:5000/api/events${showUpcomingOnly ? '?filter=true' : ''}`
+        const data = await fetchAllPages<Event>(
+          `http://127.0.0.1:5000/api/events${showUpcomingOnly ? '?filter=true' : ''}`,
+          'Failed to fetch events'
         );
-        setEvents(response.data);
-        setFilteredEvents(response.data);
+        setEvents(data);
+        setFilteredEvents(data);
         setIsLoading(false);
       } catch (err) {
         setError('Failed to fetch events');
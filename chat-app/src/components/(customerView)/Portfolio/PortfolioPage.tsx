@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import axios from 'axios';
+import { fetchAllPages } from '@/lib/pagination';
 import { 
   Briefcase, 
   Star, 
@@ -59,13 +59,13 @@ const PortfolioPage = () => {
   useEffect(() => {
     const fetchPortfolioData = async () => {
       try {
-        const [solutionsResponse, feedbacksResponse] = await Promise.all([
-          axios.get('http://127.0.0.1:5000/api/solutions'),
-          axios.get('http://127.0.0.1:5000/api/feedbacks')
+        const [solutionsData, feedbacksData] = await Promise.all([
+          fetchAllPages<Solution>('http://127.0.0.1:5000/api/solutions', 'Failed to fetch solutions'),
+          fetchAllPages<Feedback>('http://127.0.0.1:5000/api/feedbacks', 'Failed to fetch feedbacks')
         ]);
 
-        setSolutions(solutionsResponse.data);
-        setFeedbacks(feedbacksResponse.data);
+        setSolutions(solutionsData);
+        setFeedbacks(feedbacksData);
         setIsLoading(false);
       } catch (err) {
         setError('Failed to fetch portfolio data');
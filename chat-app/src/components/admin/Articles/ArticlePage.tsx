@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Loader2, Plus, Pencil, Trash2, X, Check, Search } from 'lucide-react';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { fetchAllPages } from '@/lib/pagination';
 import {
   Dialog,
   DialogContent,
@@ -49,11 +50,9 @@ const ArticlesManagePage = () => {
 
   const fetchArticles = useCallback(async () => {
     try {
-      const response = await fetch('http://127.0.0.1:5000/api/articles', {
+      const data = await fetchAllPages<Article>('http://127.0.0.1:5000/api/articles', 'Failed to fetch articles', {
         credentials: 'include',
       });
-      if (!response.ok) throw new Error('Failed to fetch articles');
-      const data = await response.json();
       setArticles(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch articles');
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Loader2, Plus, Pencil, Trash2, X, Check, Search, Calendar } from 'lucide-react';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { fetchAllPages } from '@/lib/pagination';
 import {
   Dialog,
   DialogContent,
@@ -44,11 +45,9 @@ const EventsManagePage = () => {
         ? `http://127.0.0.1:5000/api/events?filter=${filterUpcoming}`
         : 'http://127.0.0.1:5000/api/events';
       
-      const response = await fetch(url, {
+      const data = await fetchAllPages<Event>(url, 'Failed to fetch events', {
         credentials: 'include',
       });
-      if (!response.ok) throw new Error('Failed to fetch events');
-      const data = await response.json();
       setEvents(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch events');
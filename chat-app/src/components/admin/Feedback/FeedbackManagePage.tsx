@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Loader2, Plus, Pencil, Trash2, Check, Search, Star } from 'lucide-react';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { fetchAllPages } from '@/lib/pagination';
 import {
   Dialog,
   DialogContent,
@@ -34,11 +35,9 @@ const FeedbackManagePage = () => {
 
   const fetchFeedbacks = useCallback(async () => {
     try {
-      const response = await fetch('http://127.0.0.1:5000/api/feedbacks', {
+      const data = await fetchAllPages<Feedback>('http://127.0.0.1:5000/api/feedbacks', 'Failed to fetch feedbacks', {
         credentials: 'include',
       });
-      if (!response.ok) throw new Error('Failed to fetch feedbacks');
-      const data = await response.json();
       setFeedbacks(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch feedbacks');
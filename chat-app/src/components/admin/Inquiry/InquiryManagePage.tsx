@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Loader2, Search, Mail, Phone, Building, MapPin, Clock, Info, User, CheckCircle2, XCircle, HelpCircle } from 'lucide-react';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { fetchAllPages } from '@/lib/pagination';
 import {
   Dialog,
   DialogContent,
@@ -41,11 +42,9 @@ const CustomerInquiryPage = () => {
         ? `http://127.0.0.1:5000/api/contacts?status=${selectedStatus}`
         : 'http://127.0.0.1:5000/api/contacts';
       
-      const response = await fetch(url, {
+      const data = await fetchAllPages<ContactInquiry>(url, 'Failed to fetch inquiries', {
         credentials: 'include',
       });
-      if (!response.ok) throw new Error('Failed to fetch inquiries');
-      const data = await response.json();
       setInquiries(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch inquiries');
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Loader2, Plus, Pencil, Trash2, Check, Search, Building2 } from 'lucide-react';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { fetchAllPages } from '@/lib/pagination';
 import {
   Dialog,
   DialogContent,
@@ -40,11 +41,9 @@ const ManageSolutionsPage = () => {
 
   const fetchSolutions = useCallback(async () => {
     try {
-      const response = await fetch('http://127.0.0.1:5000/api/solutions', {
+      const data = await fetchAllPages<Solution>('http://127.0.0.1:5000/api/solutions', 'Failed to fetch solutions', {
         credentials: 'include',
       });
-      if (!response.ok) throw new Error('Failed to fetch solutions');
-      const data = await response.json();
       setSolutions(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch solutions');
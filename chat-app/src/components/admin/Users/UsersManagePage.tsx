@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Loader2, Search, UserPlus, UserX, Shield } from 'lucide-react';
 import { Alert, AlertDescription } from '@/components/ui/alert';
+import { fetchAllPages } from '@/lib/pagination';
 import {
   Dialog,
   DialogContent,
@@ -34,12 +35,10 @@ const UsersManagePage = () => {
 
   const fetchUsers = useCallback(async () => {
     try {
-      const response = await fetch('http://127.0.0.1:5000/api/users', {
+      const data = await fetchAllPages<User>('http://127.0.0.1:5000/api/users', 'Failed to fetch users', {
         credentials: 'include',
-      });
-      if (!response.ok) throw new Error('Failed to fetch users');
-      const data = await response.json();
-      setUsers(data.users);
+      }, (body) => (body as { users: User[] }).users);
+      setUsers(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch users');
     } finally {
@@ -0,0 +1,28 @@
+// src/lib/pagination.ts
+
+// Largest page the API hands out; fewer, bigger pages mean fewer round trips
+const PAGE_SIZE = 500;
+
+// List endpoints return one page at a time and put the cursor for the next page in
+// the X-Next-Cursor header. Follow it until the last page and return every row;
+// `rowsOf` picks the rows out of endpoints that wrap them, such as /api/users.
+export async function fetchAllPages<T>(
+  url: string,
+  errorMessage: string,
+  init: RequestInit = {},
+  rowsOf: (body: unknown) => T[] = (body) => body as T[]
+): Promise<T[]> {
+  const rows: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const pageUrl = new URL(url);
+    pageUrl.searchParams.set('limit', String(PAGE_SIZE));
+    if (cursor) pageUrl.searchParams.set('cursor', cursor);
+
+    const response = await fetch(pageUrl.toString(), init);
+    if (!response.ok) throw new Error(errorMessage);
+    rows.push(...rowsOf(await response.json()));
+    cursor = response.headers.get('X-Next-Cursor');
+  } while (cursor);
+  return rows;
+}